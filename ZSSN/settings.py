@@ -45,6 +45,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "survivor.metrics.MetricsMiddleware",
+    "survivor.instrumentation.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -82,6 +84,16 @@ DB_USER = config("DB_USER")
 DB_PASS = config("DB_PASS")
 DB_HOST = config("DB_HOST", default="zssn_postgres_1")
 DB_PORT = config("DB_PORT", default=5432)
+# Seconds a connection is kept open across requests, 0 to close it after each
+# request. Kept connections are pinged before a request reuses them.
+DB_CONN_MAX_AGE = config("DB_CONN_MAX_AGE", default=60, cast=int)
+DB_CONN_HEALTH_CHECKS = config("DB_CONN_HEALTH_CHECKS", default=True, cast=bool)
+# Set when DB_HOST is a PgBouncer in transaction pooling mode, which can not
+# keep server-side cursors open between transactions.
+DB_POOLED = config("DB_POOLED", default=False, cast=bool)
+# Threads running the async views of one process. Each thread keeps its own
+# database connection, so this also bounds the connections those views open.
+ASYNC_VIEW_THREADS = config("ASYNC_VIEW_THREADS", default=10, cast=int)
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql_psycopg2",
@@ -90,16 +102,89 @@ DATABASES = {
         "PASSWORD": DB_PASS,
         "HOST": DB_HOST,
         "PORT": DB_PORT,
+        "CONN_MAX_AGE": DB_CONN_MAX_AGE,
+        "DISABLE_SERVER_SIDE_CURSORS": DB_POOLED,
     }
 }
 
 
+# JSON is encoded and decoded with orjson when it is installed.
+REST_FRAMEWORK = {
+    "DEFAULT_RENDERER_CLASSES": [
+        "survivor.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "survivor.renderers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+}
+
+# Pagination
+# Survivor and Inventory lists are paginated with an id cursor.
+API_PAGE_SIZE = config("API_PAGE_SIZE", default=100, cast=int)
+API_MAX_PAGE_SIZE = config("API_MAX_PAGE_SIZE", default=1000, cast=int)
+
+# Bulk endpoints: largest accepted payload and rows per INSERT statement.
+BULK_MAX_ITEMS = config("BULK_MAX_ITEMS", default=10000, cast=int)
+BULK_BATCH_SIZE = config("BULK_BATCH_SIZE", default=1000, cast=int)
+
+# GET /Survivor/nearby: largest search radius (km) and number of results.
+NEARBY_MAX_RADIUS_KM = config("NEARBY_MAX_RADIUS_KM", default=500, cast=float)
+NEARBY_MAX_LIMIT = config("NEARBY_MAX_LIMIT", default=100, cast=int)
+
+# Rows fetched per server-side cursor round trip by the survivor export.
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", default=2000, cast=int)
+
+# Response cache for survivor/inventory details and the record report.
+# Any Django cache backend can be plugged in; entries live at most
+# CACHE_TTL seconds and the local-memory default keeps CACHE_MAX_ENTRIES.
+CACHES = {
+    "default": {
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default="zssn"),
+        "TIMEOUT": config("CACHE_TTL", default=300, cast=int),
+        "OPTIONS": {
+            "MAX_ENTRIES": config("CACHE_MAX_ENTRIES", default=10000, cast=int)
+        },
+    }
+}
+
+
+# Per-request wall time, database time, query counts and serializer time.
+# Sent as response headers when INSTRUMENTATION_HEADERS is on (by default
+# with DEBUG), otherwise logged for a sample of the requests.
+INSTRUMENTATION_HEADERS = config("INSTRUMENTATION_HEADERS", default=DEBUG, cast=bool)
+INSTRUMENTATION_SAMPLE_RATE = config(
+    "INSTRUMENTATION_SAMPLE_RATE", default=0.01, cast=float
+)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "survivor.requests": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        }
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
 AUTH_PASSWORD_VALIDATORS = [
     {
-        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+        "NAME": (
+            "django.contrib.auth.password_validation"
+            ".UserAttributeSimilarityValidator"
+        ),
     },
     {
         "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
@@ -16,15 +16,21 @@ Including another URLconf
 from django.urls import path
 from django.contrib import admin
 from django.urls.conf import include
-from survivor import views
+from survivor import async_views, metrics, views
 from rest_framework import routers
 
 router = routers.DefaultRouter()
 router.register(r'Inventory',views.InventoryViewSet,basename="inventory")
 router.register(r'Survivor',views.SurvivorViewSet,basename="survivor")
 router.register(r'Report',views.ReportViewSet, basename="report")
+router.register(r'changes',views.ChangeViewSet,basename="change")
 urlpatterns = [
     path('', include(router.urls)),
+    path('async/Survivor/',async_views.survivor_list,name='async-survivor-list'),
+    path('async/Survivor/record/',async_views.survivor_record,name='async-survivor-record'),
+    path('async/Survivor/nearby/',async_views.survivor_nearby,name='async-survivor-nearby'),
+    path('async/Survivor/<pk>/',async_views.survivor_detail,name='async-survivor-detail'),
+    path('metrics',metrics.metrics_view,name='metrics'),
     path('admin/', admin.site.urls),
     path('api-auth/',include('rest_framework.urls',namespace='rest_framework'))
 ]
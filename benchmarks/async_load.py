@@ -0,0 +1,164 @@
+"""Load one server process with concurrent clients, sync views against async.
+
+Starts `manage.py serve` with a single worker twice, a sync worker serving
+GET /Survivor/nearby/ and a uvicorn worker serving GET /async/Survivor/nearby/,
+and reports throughput and latency at each client concurrency. The servers
+reach the database through a local proxy delaying every reply by
+--db-latency milliseconds, standing in for a database across the network.
+
+python -m benchmarks.async_load --rows 20000 --concurrency 1 8 32 --db-latency 5
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.bulk_register import payload
+from benchmarks.utils import scratch_database, setup
+
+QUERY = "?lat=0&lon=90&radius=500&limit=20"
+
+
+def _pump(source, target, delay):
+    try:
+        while True:
+            data = source.recv(65536)
+            if not data:
+                break
+            time.sleep(delay)
+            target.sendall(data)
+    except OSError:
+        pass
+    finally:
+        source.close()
+        target.close()
+
+
+def delay_proxy(host, port, latency):
+    """Forward a local TCP port to the database, delaying what it sends back."""
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def serve():
+        while True:
+            client, _ = listener.accept()
+            if host.startswith("/"):
+                upstream = socket.socket(socket.AF_UNIX)
+                upstream.connect(f"{host}/.s.PGSQL.{port}")
+            else:
+                upstream = socket.create_connection((host, port))
+            for source, target, delay in [
+                (client, upstream, 0),
+                (upstream, client, latency / 1000),
+            ]:
+                threading.Thread(
+                    target=_pump, args=(source, target, delay), daemon=True
+                ).start()
+
+    threading.Thread(target=serve, daemon=True).start()
+    return listener.getsockname()[1]
+
+
+def wait_for(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def load(port, path, clients, duration):
+    timings = []
+    errors = []
+    deadline = time.monotonic() + duration
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            conn.request("GET", path)
+            response = conn.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+            timings.append(time.perf_counter() - start)
+        conn.close()
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise RuntimeError(f"{len(errors)} failed requests, e.g. {errors[0]}")
+    timings.sort()
+    return (
+        len(timings) / duration,
+        statistics.median(timings) * 1000,
+        timings[int(len(timings) * 0.95)] * 1000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db-latency", type=float, default=5)
+    args = parser.parse_args()
+    setup()
+
+    from survivor.serializers import SurvivorSerializer
+
+    servers = [
+        ("sync worker", [], "/Survivor/nearby/"),
+        ("uvicorn worker", ["--asgi"], "/async/Survivor/nearby/"),
+    ]
+    with scratch_database() as connection:
+        survivors = SurvivorSerializer(many=True)
+        survivors.create(survivors.run_validation(payload(args.rows)))
+        database = connection.settings_dict
+        proxy_port = delay_proxy(
+            database["HOST"], int(database["PORT"] or 5432), args.db_latency
+        )
+        env = dict(
+            os.environ,
+            DB_NAME=database["NAME"],
+            DB_HOST="127.0.0.1",
+            DB_PORT=str(proxy_port),
+        )
+        for label, options, path in servers:
+            server = subprocess.Popen(
+                [sys.executable, "manage.py", "serve", *options, "--"]
+                + ["--workers", "1", "--bind", f"127.0.0.1:{args.port}"],
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_for(args.port)
+                load(args.port, path + QUERY, 1, 1)
+                for clients in args.concurrency:
+                    rate, p50, p95 = load(
+                        args.port, path + QUERY, clients, args.duration
+                    )
+                    print(
+                        f"{label:<15} {clients:>4} clients  {rate:8.1f} req/s  "
+                        f"p50 {p50:8.2f} ms  p95 {p95:8.2f} ms"
+                    )
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Compare registering survivors one POST at a time with POST /Survivor/bulk.
+
+python -m benchmarks.bulk_register --rows 10000
+"""
+
+import argparse
+
+from benchmarks.utils import scratch_database, setup, timer
+
+
+def payload(rows):
+    return [
+        {
+            "name": f"Survivor {index}",
+            "age": index % 120,
+            "gender": "Female" if index % 2 else "Male",
+            "latitude": (index % 180) - 90,
+            "longitude": (index % 360) - 180,
+            "inventory": {"water": 4, "food": 3, "meds": 2, "ammo": 1},
+        }
+        for index in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    args = parser.parse_args()
+    setup()
+
+    from django.conf import settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    from survivor.models import Survivor
+
+    survivors = payload(args.rows)
+    client = APIClient()
+    with scratch_database():
+        with timer() as single:
+            for survivor in survivors:
+                client.post(reverse("survivor-list"), survivor, format="json")
+        assert Survivor.objects.count() == args.rows
+        Survivor.objects.all().delete()
+
+        with timer() as bulk:
+            for start in range(0, args.rows, settings.BULK_MAX_ITEMS):
+                chunk = survivors[start : start + settings.BULK_MAX_ITEMS]
+                client.post(reverse("survivor-bulk"), chunk, format="json")
+        assert Survivor.objects.count() == args.rows
+
+    for label, elapsed in [("POST /Survivor/", single), ("POST /Survivor/bulk", bulk)]:
+        rate = args.rows / elapsed["seconds"]
+        print(f"{label:<20} {elapsed['seconds']:8.2f}s {rate:10.0f} rows/s")
+    print(f"speedup: {single['seconds'] / bulk['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Per-request latency with and without persistent database connections.
+
+Requests go through Django's WSGI handler, so connections are opened, kept
+and closed exactly as they are behind a real server.
+
+python -m benchmarks.connections --requests 1000
+"""
+
+import argparse
+import statistics
+import time
+
+from benchmarks.utils import scratch_database, setup
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=1000)
+    args = parser.parse_args()
+    setup()
+
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.core.signals import request_started
+    from django.test import RequestFactory
+    from django.urls import reverse
+
+    from survivor.connections import check_connections
+    from survivor.tests.factories.inventory import InventoryFactory
+
+    handler = WSGIHandler()
+    environ = RequestFactory()._base_environ(
+        PATH_INFO=reverse("survivor-list"),
+        QUERY_STRING="page_size=1",
+        REQUEST_METHOD="GET",
+    )
+
+    def request():
+        start = time.perf_counter()
+        response = handler(dict(environ), lambda status, headers: None)
+        b"".join(response)
+        response.close()
+        return time.perf_counter() - start
+
+    scenarios = [
+        ("new connection per request", 0, False),
+        ("persistent", 60, False),
+        ("persistent + health checks", 60, True),
+    ]
+    with scratch_database() as connection:
+        InventoryFactory.create_batch(10)
+        request_started.disconnect(check_connections)
+        for label, max_age, health_checks in scenarios:
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = max_age
+            if health_checks:
+                request_started.connect(check_connections)
+            request()
+            timings = sorted(request() for _ in range(args.requests))
+            request_started.disconnect(check_connections)
+            p50 = statistics.median(timings) * 1000
+            p95 = timings[int(len(timings) * 0.95)] * 1000
+            print(f"{label:<28} p50 {p50:7.3f} ms   p95 {p95:7.3f} ms")
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
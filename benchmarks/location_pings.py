@@ -0,0 +1,64 @@
+"""Compare moving survivors one PATCH at a time with POST /Survivor/locations.
+
+python -m benchmarks.location_pings --rows 5000
+"""
+
+import argparse
+
+from benchmarks.bulk_register import payload
+from benchmarks.utils import scratch_database, setup, timer
+
+
+def fixes(ids, shift):
+    return [
+        {
+            "id": survivor_id,
+            "latitude": (index + shift) % 180 - 90,
+            "longitude": (index + shift) % 360 - 180,
+        }
+        for index, survivor_id in enumerate(ids)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+    setup()
+
+    from django.conf import settings
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    with scratch_database():
+        ids = []
+        survivors = payload(args.rows)
+        for start in range(0, args.rows, settings.BULK_MAX_ITEMS):
+            chunk = survivors[start : start + settings.BULK_MAX_ITEMS]
+            resp = client.post(reverse("survivor-bulk"), chunk, format="json")
+            ids += resp.json()["created"]
+
+        with timer() as single:
+            for fix in fixes(ids, 1):
+                url = reverse("survivor-detail", kwargs={"pk": fix.pop("id")})
+                client.patch(url, fix, format="json")
+
+        with timer() as batch:
+            pings = fixes(ids, 2)
+            for start in range(0, args.rows, settings.BULK_MAX_ITEMS):
+                chunk = pings[start : start + settings.BULK_MAX_ITEMS]
+                resp = client.post(reverse("survivor-locations"), chunk, format="json")
+                assert resp.json()["updated"] == len(chunk)
+
+    for label, elapsed in [
+        ("PATCH /Survivor/{id}/", single),
+        ("POST /Survivor/locations", batch),
+    ]:
+        rate = args.rows / elapsed["seconds"]
+        print(f"{label:<25} {elapsed['seconds']:8.2f}s {rate:10.0f} fixes/s")
+    print(f"speedup: {single['seconds'] / batch['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
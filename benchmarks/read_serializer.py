@@ -0,0 +1,62 @@
+"""Compare SurvivorSerializer with SurvivorReadSerializer on a survivor list.
+
+Both sides run the query, serialize every row and render the JSON.
+
+python -m benchmarks.read_serializer --rows 10000
+"""
+
+import argparse
+
+from benchmarks.bulk_register import payload
+from benchmarks.utils import scratch_database, setup, timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    setup()
+
+    from rest_framework.renderers import JSONRenderer
+
+    from survivor.models import Survivor
+    from survivor.serializers import SurvivorReadSerializer, SurvivorSerializer
+
+    renderer = JSONRenderer()
+
+    def model_serializer():
+        queryset = Survivor.objects.select_related("inventory").order_by("id")
+        return renderer.render(SurvivorSerializer(queryset, many=True).data)
+
+    def read_serializer():
+        queryset = (
+            Survivor.objects.select_related("inventory")
+            .order_by("id")
+            .values(*SurvivorReadSerializer.columns())
+        )
+        return renderer.render(SurvivorReadSerializer(queryset, many=True).data)
+
+    with scratch_database():
+        survivors = SurvivorSerializer(many=True)
+        survivors.create(survivors.run_validation(payload(args.rows)))
+        assert model_serializer() == read_serializer()
+
+        results = {}
+        for label, render in [
+            ("SurvivorSerializer", model_serializer),
+            ("SurvivorReadSerializer", read_serializer),
+        ]:
+            best = None
+            for _ in range(args.repeat):
+                with timer() as elapsed:
+                    render()
+                best = min(best or elapsed["seconds"], elapsed["seconds"])
+            results[label] = best
+            print(f"{label:<24} {best * 1000:8.1f} ms for {args.rows} rows")
+    speedup = results["SurvivorSerializer"] / results["SurvivorReadSerializer"]
+    print(f"speedup: {speedup:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
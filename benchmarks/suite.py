@@ -0,0 +1,302 @@
+"""Latency, query count and peak memory of the main endpoints per population.
+
+Each population gets its own scratch database, seeded with the test
+factories through bulk inserts. Every scenario then sends --requests requests
+through the full Django stack, with the response cache disabled, and the
+results are written as JSON. With --baseline, they are compared against an
+earlier results file and the run fails on any regression.
+
+python -m benchmarks.suite --populations 10000 100000 --output baseline.json
+python -m benchmarks.suite --populations 10000 100000 --baseline baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.utils import scratch_database, setup
+
+# Requests per scenario that are not timed, and requests traced for memory.
+WARMUP = 10
+TRACED = 20
+SEED_CHUNK = 10000
+# p99 of a few hundred requests is too noisy to gate on, it is only reported.
+COMPARED = ["p50_ms", "p95_ms", "queries", "peak_kib"]
+
+
+def seed(population, rng):
+    """Bulk insert `population` survivors with an inventory and a report each.
+
+    SurvivorFactory builds one chunk of survivors; larger populations repeat
+    those values, as building every row through the factories would take
+    most of the run at a million survivors.
+    """
+    from django.conf import settings
+    from django.db import connection
+
+    from survivor.models import Inventory, Report, Survivor
+    from survivor.tests.factories.survivor import SurvivorFactory
+
+    fields = ["name", "age", "gender", "latitude", "longitude", "infected"]
+    prototypes = [
+        {field: getattr(survivor, field) for field in fields}
+        for survivor in SurvivorFactory.build_batch(min(SEED_CHUNK, population))
+    ]
+    for start in range(0, population, SEED_CHUNK):
+        survivors = [Survivor(**values) for values in prototypes[: population - start]]
+        for survivor in survivors:
+            survivor.update_grid_cell()
+        Survivor.objects.bulk_create(survivors, batch_size=settings.BULK_BATCH_SIZE)
+        # InventoryFactory draws resources up to 9999, more than the record's
+        # averages can hold.
+        Inventory.objects.bulk_create(
+            [
+                Inventory(
+                    owner_survivor=survivor,
+                    water=rng.randint(0, 20),
+                    food=rng.randint(0, 20),
+                    meds=rng.randint(0, 20),
+                    ammo=rng.randint(0, 20),
+                )
+                for survivor in survivors
+            ],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+        Report.objects.bulk_create(
+            [
+                Report(gotReported=reported, whoReported=reporter)
+                for reported, reporter in zip(survivors, survivors[1:])
+            ],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+    with connection.cursor() as cursor:
+        for model in (Survivor, Inventory, Report):
+            cursor.execute(f"VACUUM ANALYZE {model._meta.db_table}")
+
+
+def scenarios(count, rng):
+    """Map each scenario to a function building its i-th request."""
+    from django.urls import reverse
+
+    from survivor.models import Inventory, Survivor
+    from survivor.points import POINTS
+
+    healthy = list(
+        Survivor.objects.filter(infected=False)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    if len(healthy) < 2 * count:
+        raise RuntimeError(f"Population too small for {count} requests")
+    picked = rng.sample(healthy, 2 * count)
+    # Each trade swaps POINTS["meds"] water for POINTS["water"] meds, so both
+    # sides always give the same points.
+    traders = list(
+        Inventory.objects.filter(
+            owner_survivor__infected=False,
+            water__gte=POINTS["meds"],
+            meds__gte=POINTS["water"],
+        )
+        .order_by("owner_survivor")
+        .values_list("owner_survivor", flat=True)[: 2 * count]
+    )
+    if len(traders) < 2 * count:
+        raise RuntimeError(f"Not enough survivors to trade {count} times")
+    nothing = {"trd_food": 0, "trd_ammo": 0}
+
+    def trade(i):
+        return (
+            "post",
+            reverse("survivor-trade"),
+            {
+                "trader_1": {
+                    "id": traders[2 * i],
+                    "trd_water": POINTS["meds"],
+                    "trd_meds": 0,
+                    **nothing,
+                },
+                "trader_2": {
+                    "id": traders[2 * i + 1],
+                    "trd_water": 0,
+                    "trd_meds": POINTS["water"],
+                    **nothing,
+                },
+            },
+        )
+
+    def fix(i):
+        return {
+            "id": picked[i],
+            "latitude": rng.uniform(-90, 90),
+            "longitude": rng.uniform(-180, 180),
+        }
+
+    return {
+        "list": lambda i: ("get", reverse("survivor-list"), None),
+        "retrieve": lambda i: (
+            "get",
+            reverse("survivor-detail", kwargs={"pk": picked[i]}),
+            None,
+        ),
+        "record": lambda i: ("get", reverse("survivor-record"), None),
+        "trade": trade,
+        # Seeded reports chain neighbouring survivors, these pairs never do.
+        "report": lambda i: (
+            "post",
+            reverse("report-list"),
+            {"gotReported": picked[i], "whoReported": picked[-1 - i]},
+        ),
+        "location": lambda i: (
+            "patch",
+            reverse("survivor-detail", kwargs={"pk": picked[i]}),
+            {key: value for key, value in fix(i).items() if key != "id"},
+        ),
+        "locations": lambda i: (
+            "post",
+            reverse("survivor-locations"),
+            [fix(rng.randrange(2 * count)) for _ in range(100)],
+        ),
+    }
+
+
+def send(client, method, path, data):
+    if data is None:
+        response = getattr(client, method)(path)
+    else:
+        response = getattr(client, method)(
+            path, json.dumps(data), content_type="application/json"
+        )
+    if response.status_code >= 400:
+        raise RuntimeError(
+            f"{method.upper()} {path} failed: {response.status_code} "
+            f"{response.content[:200]!r}"
+        )
+
+
+def measure(build, requests):
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+
+    client = Client()
+    for i in range(WARMUP):
+        send(client, *build(i))
+    timings = []
+    queries = 0
+    for i in range(WARMUP, WARMUP + requests):
+        request = build(i)
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            send(client, *request)
+            timings.append(time.perf_counter() - start)
+        queries += len(captured)
+    peak = 0
+    tracemalloc.start()
+    try:
+        for i in range(WARMUP + requests, WARMUP + requests + TRACED):
+            request = build(i)
+            tracemalloc.reset_peak()
+            send(client, *request)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    timings.sort()
+
+    def percentile(fraction):
+        return round(timings[int(len(timings) * fraction)] * 1000, 3)
+
+    return {
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "queries": round(queries / requests, 2),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance):
+    """Metrics worse than the baseline: any extra query, or latency and memory
+    more than `tolerance` above it."""
+    regressions = []
+    for population, named in baseline["results"].items():
+        for name, before in named.items():
+            after = results["results"].get(population, {}).get(name)
+            if after is None:
+                continue
+            for metric in COMPARED:
+                old = before[metric]
+                limit = old if metric == "queries" else old * (1 + tolerance)
+                if after[metric] > limit:
+                    regressions.append(
+                        f"{population:>8} {name:<10} {metric:<9} "
+                        f"{old} -> {after[metric]}"
+                    )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--populations", type=int, nargs="+", default=[10000])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--scenarios", nargs="+", default=None)
+    parser.add_argument("--output", default="benchmark-results.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Slowdown or memory growth over the baseline allowed, as a fraction.",
+    )
+    args = parser.parse_args()
+    setup()
+
+    from django.test.utils import override_settings
+
+    results = {
+        "python": platform.python_version(),
+        "requests": args.requests,
+        "results": {},
+    }
+    count = WARMUP + args.requests + TRACED
+    for population in args.populations:
+        rng = random.Random(population)
+        with scratch_database(), override_settings(
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            }
+        ):
+            started = time.perf_counter()
+            seed(population, rng)
+            print(
+                f"seeded {population} survivors in {time.perf_counter() - started:.1f}s"
+            )
+            named = scenarios(count, rng)
+            for name in args.scenarios or named:
+                metrics = measure(named[name], args.requests)
+                results["results"].setdefault(str(population), {})[name] = metrics
+                print(
+                    f"{population:>8} {name:<10} "
+                    f"p50 {metrics['p50_ms']:8.2f} ms  "
+                    f"p95 {metrics['p95_ms']:8.2f} ms  "
+                    f"p99 {metrics['p99_ms']:8.2f} ms  "
+                    f"{metrics['queries']:5.1f} queries  "
+                    f"{metrics['peak_kib']:8.1f} KiB"
+                )
+    with open(args.output, "w") as output:
+        json.dump(results, output, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(results, json.load(baseline), args.tolerance)
+        for regression in regressions:
+            print(f"regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print("no regression against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Gunicorn settings for serving ZSSN in production.
+
+Picked up automatically when gunicorn runs from the project root; use
+`python manage.py serve` to start it. Every value can be overridden from the
+environment, see the README.
+"""
+
+import multiprocessing
+import os
+
+import decouple
+
+# Every module-level name is read as a gunicorn setting, hence no
+# `from decouple import config`: gunicorn has a setting called config.
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "ZSSN.settings")
+
+
+def _local_cache():
+    """Whether the response cache lives inside each worker process."""
+    from django.conf import settings
+
+    return settings.CACHES["default"]["BACKEND"].endswith(".LocMemCache")
+
+
+bind = decouple.config("WEB_BIND", default="0.0.0.0:8000")
+# A single worker unless the response cache is shared, see on_starting.
+workers = decouple.config(
+    "WEB_WORKERS",
+    default=1 if _local_cache() else multiprocessing.cpu_count() * 2 + 1,
+    cast=int,
+)
+# Sync workers serving ZSSN.wsgi; `manage.py serve --asgi` switches both the
+# worker class and the application, which only work together.
+worker_class = "sync"
+# Import Django and the app once in the master so forked workers share it.
+preload_app = decouple.config("WEB_PRELOAD", default=True, cast=bool)
+# Seconds a worker has to finish its requests on reload (SIGHUP) or shutdown.
+graceful_timeout = decouple.config("WEB_GRACEFUL_TIMEOUT", default=30, cast=int)
+timeout = decouple.config("WEB_TIMEOUT", default=60, cast=int)
+# Seconds an idle client connection is kept open, longer than the load
+# balancer's own idle timeout so the balancer closes it first.
+keepalive = decouple.config("WEB_KEEPALIVE", default=75, cast=int)
+# Recycle workers now and then so slow leaks can not pile up.
+max_requests = decouple.config("WEB_MAX_REQUESTS", default=10000, cast=int)
+max_requests_jitter = decouple.config("WEB_MAX_REQUESTS_JITTER", default=1000, cast=int)
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    # The response cache is invalidated by the worker handling the write; a
+    # cache local to each worker would leave the others serving stale data.
+    if server.cfg.workers > 1 and _local_cache():
+        raise RuntimeError(
+            "The local-memory cache is private to each worker process: set "
+            "CACHE_BACKEND to a shared cache such as memcached, or WEB_WORKERS to 1"
+        )
+
+
+def when_ready(server):
+    # Preloading may have opened database connections in the master; the
+    # workers must not inherit its sockets.
+    from django.db import connections
+
+    connections.close_all()
+
+
+def child_exit(server, worker):
+    # Drop the live gauges of a dead worker from GET /metrics.
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
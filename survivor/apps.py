@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+
+from survivor.connections import check_connections
+from survivor.instrumentation import install_query_recorder, instrument_serializers
 
 
 class SurvivorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'survivor'
+
+    def ready(self):
+        if settings.DB_CONN_HEALTH_CHECKS:
+            request_started.connect(check_connections)
+        connection_created.connect(install_query_recorder)
+        instrument_serializers()
@@ -0,0 +1,50 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .connections import check_connections
+from .views import SurvivorViewSet
+
+# Django 3.2 has no async ORM, so the async views run the sync ones on this
+# pool. Its size bounds the concurrent queries and connections per process.
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.ASYNC_VIEW_THREADS, thread_name_prefix="async-view"
+)
+
+
+def _run(view, request, *args, **kwargs):
+    # request_started/finished fire on the event loop's thread, so the pool
+    # threads look after their own connections.
+    close_old_connections()
+    if settings.DB_CONN_HEALTH_CHECKS:
+        check_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_view(view):
+    """Serve a sync view from a coroutine, on the bounded EXECUTOR."""
+
+    async def wrapper(request, *args, **kwargs):
+        run = sync_to_async(_run, thread_sensitive=False, executor=EXECUTOR)
+        return await run(view, request, *args, **kwargs)
+
+    wrapper.csrf_exempt = getattr(view, "csrf_exempt", False)
+    return wrapper
+
+
+# GET /async/Survivor/
+survivor_list = async_view(SurvivorViewSet.as_view({"get": "list"}))
+# GET /async/Survivor/{id}/
+survivor_detail = async_view(SurvivorViewSet.as_view({"get": "retrieve"}))
+# GET /async/Survivor/record/
+survivor_record = async_view(SurvivorViewSet.as_view({"get": "record"}))
+# GET /async/Survivor/nearby/?lat=&lon=&radius=&limit=
+survivor_nearby = async_view(SurvivorViewSet.as_view({"get": "nearby"}))
@@ -0,0 +1,110 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+
+from survivor.models import Inventory
+
+# Every key embeds the current value of VERSION_KEY, so bumping it drops the
+# whole response cache at once while per-object keys drop single entries.
+VERSION_KEY = "zssn:version"
+RECORD = "record"
+MISSING = object()
+# Hit and miss counters live in the cache so that every process adds to them.
+OUTCOMES = ("hits", "misses")
+
+
+def object_key(kind, pk):
+    return f"{kind}:{pk}"
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Seeded from the clock so that a version key lost to eviction can not
+        # bring back entries written under an older version.
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def _key(name, version):
+    return f"zssn:{version}:{name}"
+
+
+def _count_key(outcome):
+    return f"zssn:{outcome}"
+
+
+def _count(outcome):
+    key = _count_key(outcome)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # First count, or the counter was evicted.
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+def stats():
+    counts = cache.get_many([_count_key(outcome) for outcome in OUTCOMES])
+    return {outcome: counts.get(_count_key(outcome), 0) for outcome in OUTCOMES}
+
+
+def peek(name):
+    """Return the cached value of name, or MISSING without loading it."""
+    value = cache.get(_key(name, _version()), MISSING)
+    if value is not MISSING:
+        _count("hits")
+    return value
+
+
+def fetch(name, load):
+    """Return the cached value of name, computing and storing it on a miss."""
+    value = peek(name)
+    if value is not MISSING:
+        return value
+    _count("misses")
+    value = load()
+    cache.set(_key(name, _version()), value)
+    return value
+
+
+def _delete(names):
+    version = _version()
+    cache.delete_many([_key(name, version) for name in names])
+
+
+def invalidate(survivor_ids=(), inventory_ids=(), record=False):
+    """Drop the cached responses of the given objects.
+
+    Entries are dropped right away and again once the current transaction
+    commits. This is best effort: a read that loaded the old rows before the
+    commit can still store them afterwards, and that entry is then served
+    until it expires after CACHE_TTL seconds.
+    """
+    names = [object_key("survivor", pk) for pk in survivor_ids]
+    names += [object_key("inventory", pk) for pk in inventory_ids]
+    if record:
+        names.append(RECORD)
+    if not names:
+        return
+    _delete(names)
+    transaction.on_commit(lambda: _delete(names))
+
+
+def invalidate_owners(survivor_ids, record=False):
+    """Drop the cached survivors along with their inventories."""
+    if not survivor_ids:
+        return
+    inventory_ids = Inventory.objects.filter(
+        owner_survivor__in=survivor_ids
+    ).values_list("pk", flat=True)
+    invalidate(survivor_ids, list(inventory_ids), record=record)
+
+
+def invalidate_all():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        _version()
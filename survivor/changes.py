@@ -0,0 +1,100 @@
+from django.conf import settings
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+
+from survivor.choices import CREATED, DELETED, INFECTED, MOVED, TRADED
+from survivor.models import Change
+from survivor.points import RESOURCES
+
+# Rows written by transactions older than every running one, so ids below
+# the cursor can no longer show up, plus the rows of the current one.
+SETTLED = RawSQL(
+    "(xact_id < pg_snapshot_xmin(pg_current_snapshot())"
+    " OR xact_id = pg_current_xact_id_if_assigned())",
+    [],
+    output_field=BooleanField(),
+)
+
+
+def _record(changes):
+    Change.objects.bulk_create(changes, batch_size=settings.BULK_BATCH_SIZE)
+
+
+def record_created(survivors):
+    """Log new survivors along with their inventory."""
+    _record(
+        [
+            Change(
+                survivor_id=survivor.pk,
+                kind=CREATED,
+                data={
+                    "name": survivor.name,
+                    "age": survivor.age,
+                    "gender": survivor.gender,
+                    "latitude": survivor.latitude,
+                    "longitude": survivor.longitude,
+                    "infected": survivor.infected,
+                    "inventory": {
+                        resource: getattr(survivor.inventory, resource)
+                        for resource in RESOURCES
+                    },
+                },
+            )
+            for survivor in survivors
+        ]
+    )
+
+
+def record_moves(locations):
+    """Log survivors moved to {survivor id: (latitude, longitude)}."""
+    _record(
+        [
+            Change(
+                survivor_id=survivor_id,
+                kind=MOVED,
+                data={"latitude": latitude, "longitude": longitude},
+            )
+            for survivor_id, (latitude, longitude) in locations.items()
+        ]
+    )
+
+
+def record_trades(trades):
+    """Log trades, each given as the trade_deltas of survivor.trading."""
+    _record(
+        [
+            Change(
+                survivor_id=owner_id,
+                kind=TRADED,
+                data={name: amount for name, amount in delta.items() if amount},
+            )
+            for deltas in trades
+            for owner_id, delta in deltas.items()
+        ]
+    )
+
+
+def record_infections(survivor_ids):
+    _record([Change(survivor_id=pk, kind=INFECTED) for pk in survivor_ids])
+
+
+def record_deletions(survivor_ids):
+    _record([Change(survivor_id=pk, kind=DELETED) for pk in survivor_ids])
+
+
+def changes_since(cursor, limit):
+    """Return up to limit changes after the cursor, oldest first.
+
+    Each change is flattened to its id, survivor, kind and data. Also tells
+    whether more changes are waiting past the last one returned.
+    """
+    rows = list(
+        Change.objects.filter(SETTLED, pk__gt=cursor)
+        .order_by("pk")
+        .values_list("pk", "survivor_id", "kind", "data")[: limit + 1]
+    )
+    changes = [
+        {"id": pk, "survivor": survivor_id, "kind": kind, **data}
+        for pk, survivor_id, kind, data in rows[:limit]
+    ]
+    return changes, len(rows) > limit
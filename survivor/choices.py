@@ -7,4 +7,21 @@ FEMALE = "Female"
 GENDER_CHOICES = [
         (MALE, MALE),
         (FEMALE, FEMALE)
-    ]
\ No newline at end of file
+    ]
+
+"""
+MODEL: CHANGE
+FIELD: KIND
+"""
+CREATED = "created"
+MOVED = "moved"
+TRADED = "traded"
+INFECTED = "infected"
+DELETED = "deleted"
+CHANGE_KIND_CHOICES = [
+        (CREATED, CREATED),
+        (MOVED, MOVED),
+        (TRADED, TRADED),
+        (INFECTED, INFECTED),
+        (DELETED, DELETED)
+    ]
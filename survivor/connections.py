@@ -0,0 +1,17 @@
+from django.db import connections
+
+
+def check_connections(**kwargs):
+    """Close kept connections the server dropped while they sat idle.
+
+    Runs at the start of each request, so a request never starts on a
+    connection that died since the previous one. Connections inside a
+    transaction are left alone.
+    """
+    for connection in connections.all():
+        if (
+            connection.connection is not None
+            and not connection.in_atomic_block
+            and not connection.is_usable()
+        ):
+            connection.close()
@@ -0,0 +1,67 @@
+import csv
+import json
+
+from django.conf import settings
+
+from survivor.models import Survivor
+from survivor.points import RESOURCES
+
+SURVIVOR_COLUMNS = ["id", "name", "age", "gender", "longitude", "latitude", "infected"]
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def export_queryset(infected=None, min_id=None, max_id=None):
+    queryset = Survivor.objects.order_by("id")
+    if infected is not None:
+        queryset = queryset.filter(infected=infected)
+    if min_id is not None:
+        queryset = queryset.filter(id__gte=min_id)
+    if max_id is not None:
+        queryset = queryset.filter(id__lte=max_id)
+    return queryset.values_list(
+        *SURVIVOR_COLUMNS,
+        "inventory__id",
+        *[f"inventory__{resource}" for resource in RESOURCES],
+    )
+
+
+def _ndjson_lines(rows):
+    width = len(SURVIVOR_COLUMNS)
+    for row in rows:
+        survivor = dict(zip(SURVIVOR_COLUMNS, row))
+        survivor["inventory"] = (
+            None if row[width] is None else dict(zip(RESOURCES, row[width + 1 :]))
+        )
+        yield json.dumps(survivor, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def _csv_lines(rows):
+    width = len(SURVIVOR_COLUMNS)
+    writer = csv.writer(_Echo())
+    yield writer.writerow(SURVIVOR_COLUMNS + RESOURCES)
+    for row in rows:
+        yield writer.writerow(row[:width] + row[width + 1 :])
+
+
+def export_chunks(queryset, export_format, chunk_size=None):
+    """Yield the export as text chunks of about chunk_size rows each.
+
+    The queryset is read through a server-side cursor, so memory stays flat
+    whatever the size of the table.
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    rows = queryset.iterator(chunk_size=chunk_size)
+    lines = _csv_lines(rows) if export_format == "csv" else _ndjson_lines(rows)
+    chunk = []
+    for line in lines:
+        chunk.append(line)
+        if len(chunk) >= chunk_size:
+            yield "".join(chunk)
+            chunk = []
+    if chunk:
+        yield "".join(chunk)
@@ -0,0 +1,72 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+# Survivors are bucketed into a fixed latitude/longitude grid so that
+# proximity searches can use a plain B-tree index on stock Postgres.
+GRID_CELL_DEGREES = 0.5
+GRID_ROWS = int(180 / GRID_CELL_DEGREES)
+GRID_COLUMNS = int(360 / GRID_CELL_DEGREES)
+MAX_GRID_CELLS = 2048
+
+
+def _row(latitude):
+    return min(int((latitude + 90) // GRID_CELL_DEGREES), GRID_ROWS - 1)
+
+
+def _column(longitude):
+    return min(int((longitude + 180) // GRID_CELL_DEGREES), GRID_COLUMNS - 1)
+
+
+def grid_cell(latitude, longitude):
+    return _row(float(latitude)) * GRID_COLUMNS + _column(float(longitude))
+
+
+def haversine(latitude_1, longitude_1, latitude_2, longitude_2):
+    phi_1, phi_2 = math.radians(latitude_1), math.radians(latitude_2)
+    a = (
+        math.sin((phi_2 - phi_1) / 2) ** 2
+        + math.cos(phi_1)
+        * math.cos(phi_2)
+        * math.sin(math.radians(longitude_2 - longitude_1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return (min_latitude, max_latitude, longitude ranges) around a point.
+
+    Longitudes are split in two ranges when the box crosses the antimeridian
+    and span the whole circle when it covers a pole.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    min_latitude = latitude - math.degrees(angle)
+    max_latitude = latitude + math.degrees(angle)
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90), min(max_latitude, 90), [(-180, 180)]
+    delta = math.degrees(
+        math.asin(min(1.0, math.sin(angle) / math.cos(math.radians(latitude))))
+    )
+    if delta >= 180:
+        return min_latitude, max_latitude, [(-180, 180)]
+    min_longitude, max_longitude = longitude - delta, longitude + delta
+    if min_longitude < -180:
+        ranges = [(min_longitude + 360, 180), (-180, max_longitude)]
+    elif max_longitude > 180:
+        ranges = [(min_longitude, 180), (-180, max_longitude - 360)]
+    else:
+        ranges = [(min_longitude, max_longitude)]
+    return min_latitude, max_latitude, ranges
+
+
+def grid_cells(min_latitude, max_latitude, longitude_ranges):
+    """Return the grid cells covering a box, or None when there are too many."""
+    rows = range(_row(min_latitude), _row(max_latitude) + 1)
+    columns = [
+        column
+        for min_longitude, max_longitude in longitude_ranges
+        for column in range(_column(min_longitude), _column(max_longitude) + 1)
+    ]
+    if len(rows) * len(columns) > MAX_GRID_CELLS:
+        return None
+    return [row * GRID_COLUMNS + column for row in rows for column in columns]
@@ -0,0 +1,182 @@
+import asyncio
+import contextvars
+import logging
+import random
+import time
+
+from django.conf import settings
+from rest_framework import serializers
+
+logger = logging.getLogger("survivor.requests")
+
+# Stats of the request being instrumented, None when it was not sampled.
+# Context variables follow the request into sync_to_async threads.
+current = contextvars.ContextVar("survivor_request_stats", default=None)
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db = 0.0
+        self.serializer = 0.0
+        self.queries = []
+        self.serializing = False
+
+    def summary(self):
+        return {
+            "wall_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "db_ms": round(self.db * 1000, 3),
+            "serializer_ms": round(self.serializer * 1000, 3),
+            "queries": len(self.queries),
+            "duplicate_queries": len(self.queries) - len(set(self.queries)),
+        }
+
+
+def record_query(execute, sql, params, many, context):
+    """Execute wrapper installed on every database connection."""
+    stats = current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db += time.perf_counter() - start
+        # Same SQL with other parameters is how an N+1 shows up.
+        stats.queries.append(sql)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def _timed_data(data):
+    def timed(serializer):
+        stats = current.get()
+        if stats is None or stats.serializing:
+            return data.fget(serializer)
+        stats.serializing = True
+        db = stats.db
+        start = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            # Queries run by lazy querysets count as database time only.
+            stats.serializer += time.perf_counter() - start - (stats.db - db)
+            stats.serializing = False
+
+    timed.instrumented = True
+    return property(timed)
+
+
+def instrument_serializers():
+    """Time serializer.data of every DRF serializer, nested ones only once."""
+    for cls in (
+        serializers.BaseSerializer,
+        serializers.Serializer,
+        serializers.ListSerializer,
+    ):
+        if not getattr(cls.__dict__["data"].fget, "instrumented", False):
+            cls.data = _timed_data(cls.__dict__["data"])
+
+
+class InstrumentationMiddleware:
+    """Wall time, database time, query counts and serializer time per request.
+
+    With INSTRUMENTATION_HEADERS they are sent back on every response, as a
+    Server-Timing header and query count headers. Otherwise a sample of
+    INSTRUMENTATION_SAMPLE_RATE requests is logged to "survivor.requests".
+    Streaming responses run their queries while the body is sent, after the
+    headers, so they are always logged once the body is done.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            # Mark the instance as a coroutine function, as Django's
+            # MiddlewareMixin does, so the async chain stays async.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def start(self):
+        if not settings.INSTRUMENTATION_HEADERS and (
+            random.random() >= settings.INSTRUMENTATION_SAMPLE_RATE
+        ):
+            return None
+        return RequestStats()
+
+    def finish(self, request, response, stats):
+        if response.streaming:
+            response.streaming_content = self.stream(
+                request, response, stats, response.streaming_content
+            )
+            return
+        summary = stats.summary()
+        if settings.INSTRUMENTATION_HEADERS:
+            response["Server-Timing"] = ", ".join(
+                f"{name};dur={summary[f'{name}_ms']}"
+                for name in ("wall", "db", "serializer")
+            )
+            response["X-Query-Count"] = summary["queries"]
+            response["X-Duplicate-Query-Count"] = summary["duplicate_queries"]
+            return
+        self.log(request, response, summary)
+
+    def log(self, request, response, summary):
+        match = request.resolver_match
+        summary = {
+            "method": request.method,
+            "path": request.path,
+            "route": match.view_name if match else None,
+            "status": response.status_code,
+            **summary,
+        }
+        logger.info(
+            " ".join(f"{key}={value}" for key, value in summary.items()),
+            extra={"instrumentation": summary},
+        )
+
+    def stream(self, request, response, stats, content):
+        """Yield the body with its chunks produced under stats."""
+        content = iter(content)
+        try:
+            while True:
+                token = current.set(stats)
+                try:
+                    chunk = next(content)
+                except StopIteration:
+                    return
+                finally:
+                    current.reset(token)
+                yield chunk
+        finally:
+            self.log(request, response, stats.summary())
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        stats = self.start()
+        if stats is None:
+            return self.get_response(request)
+        token = current.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            current.reset(token)
+        self.finish(request, response, stats)
+        return response
+
+    async def __acall__(self, request):
+        stats = self.start()
+        if stats is None:
+            return await self.get_response(request)
+        token = current.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current.reset(token)
+        self.finish(request, response, stats)
+        return response
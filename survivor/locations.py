@@ -0,0 +1,88 @@
+import math
+from numbers import Real
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from survivor.caching import invalidate
+from survivor.changes import record_moves
+from survivor.geo import grid_cell
+from survivor.models import Survivor
+
+LIMITS = {"latitude": (-90, 90), "longitude": (-180, 180)}
+# Survivor ids are bigint.
+MAX_ID = 2**63 - 1
+VALUES_ROW = "(%s::bigint, %s::double precision, %s::double precision, %s::integer)"
+
+
+def _check(value, name):
+    if name == "id":
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            return "A valid positive integer is required."
+        if value > MAX_ID:
+            return f"Ensure this value is less than or equal to {MAX_ID}."
+        return None
+    if not isinstance(value, Real) or isinstance(value, bool):
+        return "A valid number is required."
+    low, high = LIMITS[name]
+    if not math.isfinite(value) or not low <= value <= high:
+        return f"Ensure this value is between {low} and {high}."
+    return None
+
+
+def validate_fixes(data):
+    """Check a batch of location fixes without going through serializers.
+
+    Returns the valid fixes as {survivor id: (latitude, longitude)},
+    where a later fix for the same survivor replaces an earlier one, along
+    with the errors of the rejected fixes.
+    """
+    fixes, errors = {}, []
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            errors.append({"index": index, "errors": {"error": "Expected an object"}})
+            continue
+        item_errors = {}
+        for name in ("id", "latitude", "longitude"):
+            if name not in item:
+                item_errors[name] = ["This field is required."]
+                continue
+            message = _check(item[name], name)
+            if message:
+                item_errors[name] = [message]
+        if item_errors:
+            errors.append({"index": index, "errors": item_errors})
+            continue
+        fixes[item["id"]] = (float(item["latitude"]), float(item["longitude"]))
+    return fixes, errors
+
+
+def apply_fixes(fixes):
+    """Move survivors to their new locations with UPDATE ... FROM (VALUES ...).
+
+    Infected survivors are skipped by the statement itself. Returns the ids
+    of the survivors that were moved.
+    """
+    table = connection.ops.quote_name(Survivor._meta.db_table)
+    rows = [
+        (survivor_id, latitude, longitude, grid_cell(latitude, longitude))
+        for survivor_id, (latitude, longitude) in fixes.items()
+    ]
+    updated = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), settings.BULK_BATCH_SIZE):
+            batch = rows[start : start + settings.BULK_BATCH_SIZE]
+            values = ", ".join([VALUES_ROW] * len(batch))
+            cursor.execute(
+                f"UPDATE {table} AS s"
+                " SET latitude = v.latitude, longitude = v.longitude,"
+                " grid_cell = v.grid_cell"
+                f" FROM (VALUES {values}) AS v (id, latitude, longitude, grid_cell)"
+                " WHERE s.id = v.id AND NOT s.infected"
+                " RETURNING s.id",
+                [value for row in batch for value in row],
+            )
+            updated += [row[0] for row in cursor.fetchall()]
+        record_moves({survivor_id: fixes[survivor_id] for survivor_id in updated})
+    invalidate(updated)
+    return updated
@@ -0,0 +1,256 @@
+import json
+import random
+import re
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from survivor.choices import GENDER_CHOICES
+from survivor.models import Inventory, Report, Survivor
+
+EXPLAINED = ("SELECT", "UPDATE", "DELETE", "WITH")
+SERVER_CURSOR = re.compile(r"^DECLARE .+? CURSOR .*?FOR (.*)$", re.DOTALL)
+# Endpoints reading whole tables by design: their plans are listed, not checked.
+FULL_SCANS = {"GET /Survivor/export?infected=true"}
+
+
+def _rows(node):
+    """Rows a plan node read from its relation, over all loops."""
+    read = node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+    return read * node.get("Actual Loops", 1)
+
+
+def _seq_scans(node):
+    if node["Node Type"] == "Seq Scan":
+        yield node["Relation Name"], _rows(node)
+    for child in node.get("Plans", []):
+        yield from _seq_scans(child)
+
+
+class Command(BaseCommand):
+    help = (
+        "EXPLAIN ANALYZE the queries behind each endpoint and fail on sequential "
+        "scans reading more rows than a threshold. Everything, including the "
+        "optional seed data, is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many synthetic survivors before explaining.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=int,
+            default=1000,
+            help="Largest number of rows a sequential scan may read.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["seed"]:
+                self.seed(options["seed"])
+            offenders = self.explain_endpoints(options["threshold"])
+            transaction.set_rollback(True)
+        if offenders:
+            raise CommandError(
+                f"{len(offenders)} queries use sequential scans: "
+                + ", ".join(sorted(set(offenders)))
+            )
+        self.stdout.write(self.style.SUCCESS("No sequential scan above threshold"))
+
+    def seed(self, count):
+        rng = random.Random(0)
+        genders = [value for value, _ in GENDER_CHOICES]
+        survivors = []
+        for index in range(count):
+            survivor = Survivor(
+                name=f"Seed {index}",
+                age=rng.randint(0, 120),
+                gender=rng.choice(genders),
+                latitude=rng.uniform(-90, 90),
+                longitude=rng.uniform(-180, 180),
+                infected=rng.random() < 0.1,
+            )
+            survivor.update_grid_cell()
+            survivors.append(survivor)
+        Survivor.objects.bulk_create(survivors, batch_size=settings.BULK_BATCH_SIZE)
+        Inventory.objects.bulk_create(
+            [
+                Inventory(
+                    owner_survivor=survivor,
+                    water=rng.randint(0, 10),
+                    food=rng.randint(0, 10),
+                    meds=rng.randint(0, 10),
+                    ammo=rng.randint(0, 10),
+                )
+                for survivor in survivors
+            ],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+        Report.objects.bulk_create(
+            [
+                Report(gotReported=reported, whoReported=reporter)
+                for reported, reporter in zip(survivors, survivors[1:])
+            ],
+            batch_size=settings.BULK_BATCH_SIZE,
+        )
+        with connection.cursor() as cursor:
+            for model in (Survivor, Inventory, Report):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+    def endpoints(self):
+        healthy = list(
+            Survivor.objects.filter(infected=False, inventory__isnull=False)
+            .order_by("id")
+            .values_list("id", "inventory__id")[:3]
+        )
+        if len(healthy) < 3:
+            raise CommandError("Need at least 3 healthy survivors, use --seed")
+        (first, inventory), (second, _), (third, _) = healthy
+        nothing = {f"trd_{name}": 0 for name in ("water", "food", "meds", "ammo")}
+        trade = {
+            "trader_1": {"id": first, **nothing},
+            "trader_2": {"id": second, **nothing},
+        }
+        fix = {"id": first, "latitude": 10, "longitude": 10}
+        detail = reverse("survivor-detail", kwargs={"pk": first})
+        return [
+            ("GET /Survivor/", "get", reverse("survivor-list"), None, {}),
+            (
+                "GET /Survivor/?fields",
+                "get",
+                reverse("survivor-list"),
+                {"fields": "id,name"},
+                {},
+            ),
+            ("GET /Survivor/{id}/", "get", detail, None, {}),
+            (
+                "GET /Survivor/{id}/ If-None-Match",
+                "get",
+                detail,
+                None,
+                {"HTTP_IF_NONE_MATCH": '"0"'},
+            ),
+            ("GET /Survivor/report", "get", reverse("survivor-record"), None, {}),
+            (
+                "GET /Survivor/nearby",
+                "get",
+                reverse("survivor-nearby"),
+                {"lat": 0, "lon": 0, "radius": 50},
+                {},
+            ),
+            (
+                "GET /Survivor/export?infected=true",
+                "get",
+                reverse("survivor-export"),
+                {"infected": "true"},
+                {},
+            ),
+            ("GET /Inventory/", "get", reverse("inventory-list"), None, {}),
+            (
+                "GET /Inventory/{id}/",
+                "get",
+                reverse("inventory-detail", kwargs={"pk": inventory}),
+                None,
+                {},
+            ),
+            ("PATCH /Survivor/{id}/", "patch", detail, fix, {}),
+            (
+                "POST /Survivor/locations",
+                "post",
+                reverse("survivor-locations"),
+                [fix],
+                {},
+            ),
+            ("POST /Survivor/trade", "post", reverse("survivor-trade"), trade, {}),
+            (
+                "POST /Survivor/trade/batch",
+                "post",
+                reverse("survivor-trade-batch"),
+                [trade],
+                {},
+            ),
+            (
+                "POST /Report/",
+                "post",
+                reverse("report-list"),
+                {"gotReported": third, "whoReported": second},
+                {},
+            ),
+            (
+                "POST /Report/bulk",
+                "post",
+                reverse("report-bulk"),
+                [{"gotReported": first, "whoReported": third}],
+                {},
+            ),
+        ]
+
+    def captured_queries(self, method, path, data, headers):
+        client = Client()
+        with CaptureQueriesContext(connection) as captured:
+            if method == "get":
+                response = client.get(path, data, **headers)
+            else:
+                response = getattr(client, method)(
+                    path, json.dumps(data), content_type="application/json", **headers
+                )
+            if response.streaming:
+                b"".join(response.streaming_content)
+        if response.status_code >= 500:
+            raise CommandError(
+                f"{method.upper()} {path} failed: {response.status_code}"
+            )
+        for query in captured.captured_queries:
+            sql = query["sql"]
+            match = SERVER_CURSOR.match(sql)
+            if match:
+                sql = match.group(1)
+            if sql.lstrip().upper().startswith(EXPLAINED):
+                yield sql
+
+    def explain(self, sql):
+        # Each statement runs in a savepoint that is rolled back right away,
+        # so EXPLAIN ANALYZE does not apply a write twice.
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + sql)
+            (plan,) = cursor.fetchone()
+            transaction.set_rollback(True)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return plan[0]
+
+    def explain_endpoints(self, threshold):
+        offenders = []
+        with override_settings(
+            ALLOWED_HOSTS=["testserver"],
+            CACHES={
+                "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+            },
+        ):
+            for label, method, path, data, headers in self.endpoints():
+                for sql in self.captured_queries(method, path, data, headers):
+                    plan = self.explain(sql)
+                    scans = [
+                        (table, rows)
+                        for table, rows in _seq_scans(plan["Plan"])
+                        if rows > threshold
+                    ]
+                    summary = ", ".join(
+                        f"seq scan on {table} ({rows} rows)" for table, rows in scans
+                    )
+                    self.stdout.write(
+                        f"{label:<36} {plan['Execution Time']:9.3f} ms  "
+                        f"{sql[:60]}{'...' if len(sql) > 60 else ''}"
+                    )
+                    if scans and label not in FULL_SCANS:
+                        self.stderr.write(f"  {summary}")
+                        offenders.append(label)
+        return offenders
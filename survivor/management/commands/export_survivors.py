@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from survivor.export import EXPORT_FORMATS, export_chunks, export_queryset
+
+
+def _boolean(value):
+    return value.lower() in ("1", "true", "yes")
+
+
+class Command(BaseCommand):
+    help = "Stream every survivor with its inventory as NDJSON or CSV."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="ndjson")
+        parser.add_argument("--infected", type=_boolean, default=None)
+        parser.add_argument("--min-id", type=int, default=None)
+        parser.add_argument("--max-id", type=int, default=None)
+        parser.add_argument("--chunk-size", type=int, default=None)
+        parser.add_argument(
+            "--output", default="-", help="File to write to, '-' for stdout."
+        )
+
+    def handle(self, *args, **options):
+        queryset = export_queryset(
+            infected=options["infected"],
+            min_id=options["min_id"],
+            max_id=options["max_id"],
+        )
+        chunks = export_chunks(queryset, options["format"], options["chunk_size"])
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+        with open(options["output"], "w", newline="") as output:
+            for chunk in chunks:
+                output.write(chunk)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from survivor.caching import invalidate
+from survivor.records import COUNTERS, count_record, load_record, rebuild_record
+
+
+class Command(BaseCommand):
+    help = "Rebuild the record statistics from a full recount and report any drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify the stored statistics, exiting non-zero on drift.",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            stored, totals = load_record(), count_record()
+        else:
+            stored, totals = rebuild_record()
+            invalidate(record=True)
+        drift = [name for name in COUNTERS if stored[name] != totals[name]]
+        for name in drift:
+            self.stderr.write(f"{name}: stored {stored[name]}, counted {totals[name]}")
+        if options["check"] and drift:
+            raise CommandError(f"{len(drift)} statistics counters drifted")
+        if options["check"]:
+            self.stdout.write(self.style.SUCCESS("Statistics match a full recount"))
+        else:
+            self.stdout.write(self.style.SUCCESS("Statistics rebuilt"))
@@ -0,0 +1,206 @@
+import io
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from survivor.caching import invalidate
+from survivor.choices import GENDER_CHOICES
+from survivor.geo import GRID_CELL_DEGREES, GRID_COLUMNS, GRID_ROWS
+from survivor.models import Inventory, Report, Survivor
+from survivor.reporting import INFECTION_THRESHOLD
+
+FIRST_NAMES = np.array(
+    ["Ana", "Bruno", "Carla", "Davi", "Elisa", "Felipe", "Gabriela", "Heitor"]
+    + ["Iris", "João", "Karen", "Lucas", "Marina", "Nicolas", "Olivia", "Pedro"]
+)
+LAST_NAMES = np.array(
+    ["Almeida", "Barbosa", "Cardoso", "Dias", "Esteves", "Ferreira", "Gomes"]
+    + ["Lima", "Martins", "Nunes", "Oliveira", "Pereira", "Rocha", "Silva"]
+)
+# Mean amount of each resource in an inventory.
+RESOURCE_MEANS = {"water": 6, "food": 8, "meds": 3, "ammo": 10}
+# Share of healthy survivors with 0, 1 and 2 reports against them.
+HEALTHY_REPORTS = [0.8, 0.15, 0.05]
+# Infected survivors got between INFECTION_THRESHOLD and this many more.
+EXTRA_INFECTED_REPORTS = 2
+# Share of survivors scattered anywhere instead of around a cluster.
+SCATTERED = 0.1
+
+
+def _uniform_latitudes(rng, count):
+    # Uniform over the sphere rather than over the latitude range.
+    return np.degrees(np.arcsin(rng.uniform(-1, 1, count)))
+
+
+def _locations(rng, count, clusters, spread):
+    """Survivors gathered around cluster centres, a few big and many small."""
+    centre_latitudes = _uniform_latitudes(rng, clusters)
+    centre_longitudes = rng.uniform(-180, 180, clusters)
+    weights = 1 / np.arange(1, clusters + 1)
+    cluster = rng.choice(clusters, size=count, p=weights / weights.sum())
+    latitudes = np.clip(
+        centre_latitudes[cluster] + rng.normal(0, spread, count), -90, 90
+    )
+    longitudes = (
+        centre_longitudes[cluster] + rng.normal(0, spread, count) + 180
+    ) % 360 - 180
+    scattered = rng.random(count) < SCATTERED
+    latitudes[scattered] = _uniform_latitudes(rng, scattered.sum())
+    longitudes[scattered] = rng.uniform(-180, 180, scattered.sum())
+    return latitudes, longitudes
+
+
+def _grid_cells(latitudes, longitudes):
+    """survivor.geo.grid_cell over whole arrays."""
+    rows = np.minimum((latitudes + 90) // GRID_CELL_DEGREES, GRID_ROWS - 1)
+    columns = np.minimum((longitudes + 180) // GRID_CELL_DEGREES, GRID_COLUMNS - 1)
+    return (rows * GRID_COLUMNS + columns).astype(np.int64)
+
+
+def _reports(rng, infected, counts):
+    """(reported, reporter) index pairs, counts[i] of them against survivor i.
+
+    Reporters are healthy, never the reported survivor and never twice the
+    same for one survivor: the reports against a survivor come from
+    consecutive healthy survivors, starting at a random offset past it.
+    """
+    healthy = np.flatnonzero(~infected)
+    if len(healthy) <= counts.max():
+        raise CommandError("Not enough healthy survivors to file the reports")
+    position = np.empty(len(infected), dtype=np.int64)
+    position[healthy] = np.arange(len(healthy))
+    position[infected] = rng.integers(0, len(healthy), infected.sum())
+    offset = rng.integers(0, len(healthy) - counts.max(), len(infected))
+    reported = np.repeat(np.arange(len(infected)), counts)
+    slot = np.arange(len(reported)) - np.repeat(np.cumsum(counts) - counts, counts)
+    step = 1 + offset[reported] + slot
+    return reported, healthy[(position[reported] + step) % len(healthy)]
+
+
+def _copy(cursor, model, columns, chunk_size):
+    """COPY columns, a mapping of field name to array, into the model's table."""
+    table = connection.ops.quote_name(model._meta.db_table)
+    names = ", ".join(
+        connection.ops.quote_name(model._meta.get_field(name).column)
+        for name in columns
+    )
+    length = len(next(iter(columns.values())))
+    for start in range(0, length, chunk_size):
+        text = [
+            values[start : start + chunk_size].astype(str)
+            for values in columns.values()
+        ]
+        buffer = io.StringIO("".join("\t".join(row) + "\n" for row in zip(*text)))
+        cursor.copy_expert(f"COPY {table} ({names}) FROM STDIN", buffer)
+
+
+class Command(BaseCommand):
+    help = (
+        "Insert a synthetic population of survivors with inventories and "
+        "reports, generated from a fixed seed and loaded with COPY."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("survivors", type=int)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--infected",
+            type=float,
+            default=0.1,
+            help="Share of infected survivors.",
+        )
+        parser.add_argument(
+            "--clusters",
+            type=int,
+            default=100,
+            help="Number of places survivors gather around.",
+        )
+        parser.add_argument(
+            "--spread",
+            type=float,
+            default=1.0,
+            help="Standard deviation of a cluster, in degrees.",
+        )
+        parser.add_argument("--chunk-size", type=int, default=100000)
+
+    def handle(self, *args, **options):
+        count = options["survivors"]
+        if count < 1:
+            raise CommandError("Seed at least one survivor")
+        if not 0 <= options["infected"] < 1:
+            raise CommandError("--infected must be in [0, 1)")
+        started = time.perf_counter()
+        rng = np.random.default_rng(options["seed"])
+
+        infected = rng.random(count) < options["infected"]
+        report_counts = np.where(
+            infected,
+            INFECTION_THRESHOLD + rng.integers(0, EXTRA_INFECTED_REPORTS + 1, count),
+            rng.choice(len(HEALTHY_REPORTS), size=count, p=HEALTHY_REPORTS),
+        )
+        reported, reporters = _reports(rng, infected, report_counts)
+        latitudes, longitudes = _locations(
+            rng, count, max(options["clusters"], 1), options["spread"]
+        )
+        names = np.char.add(
+            np.char.add(rng.choice(FIRST_NAMES, count), " "),
+            rng.choice(LAST_NAMES, count),
+        )
+        genders = np.array([value for value, _ in GENDER_CHOICES])
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Reserve the survivor ids up front, the inventories and reports
+            # point at them.
+            cursor.execute(
+                "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+                "nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+                [Survivor._meta.db_table, Survivor._meta.db_table, count],
+            )
+            ids = np.arange(count, dtype=np.int64) + cursor.fetchone()[0] - count + 1
+            _copy(
+                cursor,
+                Survivor,
+                {
+                    "id": ids,
+                    "name": names,
+                    "age": np.clip(rng.normal(35, 18, count), 0, 120).astype(int),
+                    "gender": rng.choice(genders, count),
+                    "latitude": latitudes,
+                    "longitude": longitudes,
+                    "infected": infected,
+                    "report_count": report_counts,
+                    "grid_cell": _grid_cells(latitudes, longitudes),
+                    "version": np.ones(count, dtype=np.int64),
+                },
+                options["chunk_size"],
+            )
+            _copy(
+                cursor,
+                Inventory,
+                {
+                    "owner_survivor": ids,
+                    **{
+                        resource: rng.poisson(mean, count)
+                        for resource, mean in RESOURCE_MEANS.items()
+                    },
+                    "version": np.ones(count, dtype=np.int64),
+                },
+                options["chunk_size"],
+            )
+            _copy(
+                cursor,
+                Report,
+                {"gotReported": ids[reported], "whoReported": ids[reporters]},
+                options["chunk_size"],
+            )
+            for model in (Survivor, Inventory, Report):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+        invalidate(record=True)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {count} survivors ({infected.sum()} infected) and "
+                f"{len(reported)} reports in {time.perf_counter() - started:.1f}s"
+            )
+        )
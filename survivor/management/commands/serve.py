@@ -0,0 +1,51 @@
+import glob
+import os
+import sys
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the API with gunicorn and gunicorn.conf.py, under the same "
+        "settings module as this command. Arguments after -- go to gunicorn."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--asgi",
+            action="store_true",
+            help="Serve ZSSN.asgi with uvicorn workers instead of ZSSN.wsgi.",
+        )
+        parser.add_argument("gunicorn_args", nargs="*")
+
+    def handle(self, *args, **options):
+        argv = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "--config",
+            str(settings.BASE_DIR / "gunicorn.conf.py"),
+            "--chdir",
+            str(settings.BASE_DIR),
+        ]
+        if options["asgi"]:
+            argv += ["--worker-class", "uvicorn.workers.UvicornWorker"]
+        argv += options["gunicorn_args"]
+        argv.append(
+            "ZSSN.asgi:application" if options["asgi"] else "ZSSN.wsgi:application"
+        )
+        os.environ["DJANGO_SETTINGS_MODULE"] = settings.SETTINGS_MODULE
+        # Workers write their metrics to files in this directory and GET
+        # /metrics adds them up; the files of a previous run are dropped, and
+        # only those, since the directory may be the user's.
+        metrics_dir = os.environ.setdefault(
+            "PROMETHEUS_MULTIPROC_DIR",
+            os.path.join(tempfile.gettempdir(), "zssn-metrics"),
+        )
+        os.makedirs(metrics_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(path)
+        os.execv(sys.executable, argv)
@@ -0,0 +1,109 @@
+import asyncio
+import os
+import time
+
+from django.db import transaction
+from django.http import HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from survivor.points import RESOURCES
+
+# With PROMETHEUS_MULTIPROC_DIR set, as the serve command does, every process
+# writes its samples to memory-mapped files in that directory and GET
+# /metrics adds up the files of all of them. Domain counters only move once
+# the transaction that made the change commits.
+
+REQUEST_DURATION = Histogram(
+    "zssn_request_duration_seconds",
+    "Time to answer a request, by route.",
+    ["route", "method", "status"],
+)
+TRADES = Counter("zssn_trades", "Trades executed.")
+TRADES_REJECTED = Counter(
+    "zssn_trades_rejected", "Trades rejected, by reason.", ["reason"]
+)
+RESOURCES_MOVED = Counter(
+    "zssn_resources_moved",
+    "Resources that changed hands in trades, by type.",
+    ["resource"],
+)
+REPORTS = Counter("zssn_reports", "Infection reports filed.")
+INFECTIONS = Counter("zssn_infections", "Survivors flagged as infected.")
+
+
+def _count_trade(offer_1, offer_2):
+    TRADES.inc()
+    for resource in RESOURCES:
+        moved = offer_1[f"trd_{resource}"] + offer_2[f"trd_{resource}"]
+        if moved:
+            RESOURCES_MOVED.labels(resource).inc(moved)
+
+
+def count_trade(offer_1, offer_2):
+    transaction.on_commit(lambda: _count_trade(offer_1, offer_2))
+
+
+def count_rejected_trade(error):
+    TRADES_REJECTED.labels(error.reason).inc()
+
+
+def count_reports(count):
+    if count:
+        transaction.on_commit(lambda: REPORTS.inc(count))
+
+
+def count_infections(count):
+    if count:
+        transaction.on_commit(lambda: INFECTIONS.inc(count))
+
+
+def metrics_view(request):
+    # GET /metrics
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """Observe the duration of every request in REQUEST_DURATION."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if asyncio.iscoroutinefunction(get_response):
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def observe(self, request, response, started):
+        match = request.resolver_match
+        REQUEST_DURATION.labels(
+            match.view_name if match else "unmatched",
+            request.method,
+            response.status_code,
+        ).observe(time.perf_counter() - started)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.__acall__(request)
+        started = time.perf_counter()
+        response = self.get_response(request)
+        self.observe(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        self.observe(request, response, started)
+        return response
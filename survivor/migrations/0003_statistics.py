@@ -0,0 +1,203 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:15
+
+from django.db import migrations, models
+
+COUNTERS = [
+    "infected_count",
+    "healthy_count",
+    "water",
+    "food",
+    "meds",
+    "ammo",
+    "infected_water",
+    "infected_food",
+    "infected_meds",
+    "infected_ammo",
+]
+
+# Deltas are aggregated per statement from the transition tables, so a trade
+# (one UPDATE moving resources between two inventories) nets out to zero and
+# never touches the counters row.
+APPLY_FUNCTION = """
+CREATE FUNCTION survivor_statistics_apply(%(args)s) RETURNS void AS $$
+BEGIN
+    IF %(zero_check)s THEN
+        RETURN;
+    END IF;
+    INSERT INTO survivor_statistics (id, %(columns)s)
+    VALUES (1, %(params)s)
+    ON CONFLICT (id) DO UPDATE SET %(increments)s;
+END;
+$$ LANGUAGE plpgsql;
+""" % {
+    "args": ", ".join(f"d_{name} bigint" for name in COUNTERS),
+    "zero_check": " AND ".join(f"d_{name} = 0" for name in COUNTERS),
+    "columns": ", ".join(COUNTERS),
+    "params": ", ".join(f"d_{name}" for name in COUNTERS),
+    "increments": ", ".join(
+        f"{name} = survivor_statistics.{name} + EXCLUDED.{name}" for name in COUNTERS
+    ),
+}
+
+SURVIVOR_COUNTS = """
+        PERFORM survivor_statistics_apply(
+            d.infected, d.healthy, 0, 0, 0, 0, 0, 0, 0, 0
+        ) FROM (
+            SELECT %(sign)scount(*) FILTER (WHERE infected) AS infected,
+                   %(sign)scount(*) FILTER (WHERE NOT infected) AS healthy
+            FROM %(table)s
+        ) d;"""
+
+SURVIVOR_FUNCTION = """
+CREATE FUNCTION survivor_statistics_survivor() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN%(insert)s
+    ELSIF TG_OP = 'DELETE' THEN%(delete)s
+    ELSE
+        PERFORM survivor_statistics_apply(
+            d.infected, -d.infected, 0, 0, 0, 0, d.water, d.food, d.meds, d.ammo
+        ) FROM (
+            SELECT coalesce(sum(f.sign), 0) AS infected,
+                   coalesce(sum(f.sign * i.water), 0) AS water,
+                   coalesce(sum(f.sign * i.food), 0) AS food,
+                   coalesce(sum(f.sign * i.meds), 0) AS meds,
+                   coalesce(sum(f.sign * i.ammo), 0) AS ammo
+            FROM (
+                SELECT n.id, CASE WHEN n.infected THEN 1 ELSE -1 END AS sign
+                FROM new_rows n JOIN old_rows o ON o.id = n.id
+                WHERE n.infected <> o.infected
+            ) f
+            LEFT JOIN survivor_inventory i ON i.owner_survivor_id = f.id
+        ) d;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""" % {
+    "insert": SURVIVOR_COUNTS % {"sign": "", "table": "new_rows"},
+    "delete": SURVIVOR_COUNTS % {"sign": "-", "table": "old_rows"},
+}
+
+INVENTORY_DELTAS = """
+        PERFORM survivor_statistics_apply(
+            0, 0, d.water, d.food, d.meds, d.ammo,
+            d.infected_water, d.infected_food, d.infected_meds, d.infected_ammo
+        ) FROM (
+            SELECT coalesce(sum(c.sign * c.water), 0) AS water,
+                   coalesce(sum(c.sign * c.food), 0) AS food,
+                   coalesce(sum(c.sign * c.meds), 0) AS meds,
+                   coalesce(sum(c.sign * c.ammo), 0) AS ammo,
+                   coalesce(sum(c.sign * c.water) FILTER (WHERE s.infected), 0)
+                       AS infected_water,
+                   coalesce(sum(c.sign * c.food) FILTER (WHERE s.infected), 0)
+                       AS infected_food,
+                   coalesce(sum(c.sign * c.meds) FILTER (WHERE s.infected), 0)
+                       AS infected_meds,
+                   coalesce(sum(c.sign * c.ammo) FILTER (WHERE s.infected), 0)
+                       AS infected_ammo
+            FROM (%(changes)s) c
+            LEFT JOIN survivor_survivor s ON s.id = c.owner_survivor_id
+        ) d;"""
+
+INVENTORY_FUNCTION = """
+CREATE FUNCTION survivor_statistics_inventory() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN%(insert)s
+    ELSIF TG_OP = 'DELETE' THEN%(delete)s
+    ELSE%(update)s
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+""" % {
+    "insert": INVENTORY_DELTAS % {"changes": "SELECT 1 AS sign, * FROM new_rows"},
+    "delete": INVENTORY_DELTAS % {"changes": "SELECT -1 AS sign, * FROM old_rows"},
+    "update": INVENTORY_DELTAS
+    % {
+        "changes": "SELECT -1 AS sign, * FROM old_rows "
+        "UNION ALL SELECT 1 AS sign, * FROM new_rows"
+    },
+}
+
+TRIGGERS = """
+CREATE TRIGGER survivor_statistics_%(table)s_%(event)s
+AFTER %(event)s ON survivor_%(table)s
+REFERENCING %(transitions)s
+FOR EACH STATEMENT EXECUTE FUNCTION survivor_statistics_%(table)s();
+"""
+
+TRANSITIONS = {
+    "insert": "NEW TABLE AS new_rows",
+    "delete": "OLD TABLE AS old_rows",
+    "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+}
+
+CREATE_TRIGGERS = "".join(
+    TRIGGERS % {"table": table, "event": event, "transitions": transitions}
+    for table in ["survivor", "inventory"]
+    for event, transitions in TRANSITIONS.items()
+)
+
+DROP_TRIGGERS = "".join(
+    f"DROP TRIGGER survivor_statistics_{table}_{event} ON survivor_{table};"
+    for table in ["survivor", "inventory"]
+    for event in TRANSITIONS
+)
+
+BACKFILL = """
+INSERT INTO survivor_statistics (id, %(columns)s)
+SELECT 1,
+       count(*) FILTER (WHERE s.infected),
+       count(*) FILTER (WHERE NOT s.infected),
+       coalesce(sum(i.water), 0),
+       coalesce(sum(i.food), 0),
+       coalesce(sum(i.meds), 0),
+       coalesce(sum(i.ammo), 0),
+       coalesce(sum(i.water) FILTER (WHERE s.infected), 0),
+       coalesce(sum(i.food) FILTER (WHERE s.infected), 0),
+       coalesce(sum(i.meds) FILTER (WHERE s.infected), 0),
+       coalesce(sum(i.ammo) FILTER (WHERE s.infected), 0)
+FROM survivor_survivor s
+LEFT JOIN survivor_inventory i ON i.owner_survivor_id = s.id;
+""" % {
+    "columns": ", ".join(COUNTERS)
+}
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivor', '0002_auto_20220106_1914'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Statistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('infected_count', models.BigIntegerField(default=0)),
+                ('healthy_count', models.BigIntegerField(default=0)),
+                ('water', models.BigIntegerField(default=0)),
+                ('food', models.BigIntegerField(default=0)),
+                ('meds', models.BigIntegerField(default=0)),
+                ('ammo', models.BigIntegerField(default=0)),
+                ('infected_water', models.BigIntegerField(default=0)),
+                ('infected_food', models.BigIntegerField(default=0)),
+                ('infected_meds', models.BigIntegerField(default=0)),
+                ('infected_ammo', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'statistics',
+            },
+        ),
+        migrations.RunSQL(
+            sql=[APPLY_FUNCTION, SURVIVOR_FUNCTION, INVENTORY_FUNCTION],
+            reverse_sql=[
+                "DROP FUNCTION survivor_statistics_inventory();",
+                "DROP FUNCTION survivor_statistics_survivor();",
+                "DROP FUNCTION survivor_statistics_apply(%s);"
+                % ", ".join(["bigint"] * len(COUNTERS)),
+            ],
+        ),
+        migrations.RunSQL(sql=[CREATE_TRIGGERS, BACKFILL], reverse_sql=DROP_TRIGGERS),
+    ]
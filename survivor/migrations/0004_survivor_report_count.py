@@ -0,0 +1,30 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:22
+
+from django.db import migrations, models
+
+BACKFILL = """
+UPDATE survivor_survivor AS s
+SET report_count = r.total
+FROM (
+    SELECT "gotReported_id" AS survivor_id, count(*) AS total
+    FROM survivor_report
+    GROUP BY "gotReported_id"
+) AS r
+WHERE s.id = r.survivor_id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("survivor", "0003_statistics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="survivor",
+            name="report_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(sql=BACKFILL, reverse_sql=migrations.RunSQL.noop),
+    ]
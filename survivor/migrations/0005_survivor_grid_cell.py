@@ -0,0 +1,29 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:24
+
+from django.db import migrations, models
+
+# Same 0.5 degree grid as survivor.geo.grid_cell: 360 rows of 720 columns.
+BACKFILL = """
+UPDATE survivor_survivor
+SET grid_cell = LEAST(floor((latitude + 90) / 0.5)::integer, 359) * 720
+              + LEAST(floor((longitude + 180) / 0.5)::integer, 719);
+"""
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivor', '0004_survivor_report_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='survivor',
+            name='grid_cell',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunSQL(sql=BACKFILL, reverse_sql=migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='survivor',
+            index=models.Index(condition=models.Q(('infected', False)), fields=['grid_cell'], include=('latitude', 'longitude'), name='survivor_healthy_grid_idx'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:40
+
+from django.db import migrations, models
+
+# Columns that make up the API representation of each table. Any UPDATE
+# changing one of them bumps the row version, whatever code path issued it;
+# the version a client sends back is ignored.
+VERSIONED_COLUMNS = {
+    "survivor": ["name", "age", "gender", "latitude", "longitude", "infected"],
+    "inventory": ["owner_survivor_id", "water", "food", "meds", "ammo"],
+}
+
+FUNCTION = """
+CREATE FUNCTION survivor_%(table)s_version() RETURNS trigger AS $$
+BEGIN
+    NEW.version := OLD.version;
+    IF (%(new)s) IS DISTINCT FROM (%(old)s) THEN
+        NEW.version := OLD.version + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER survivor_%(table)s_version
+BEFORE UPDATE ON survivor_%(table)s
+FOR EACH ROW EXECUTE FUNCTION survivor_%(table)s_version();
+"""
+
+CREATE = [
+    FUNCTION
+    % {
+        "table": table,
+        "new": ", ".join(f"NEW.{column}" for column in columns),
+        "old": ", ".join(f"OLD.{column}" for column in columns),
+    }
+    for table, columns in VERSIONED_COLUMNS.items()
+]
+
+DROP = [
+    f"DROP TRIGGER survivor_{table}_version ON survivor_{table};"
+    f"DROP FUNCTION survivor_{table}_version();"
+    for table in VERSIONED_COLUMNS
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivor', '0005_survivor_grid_cell'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventory',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='survivor',
+            name='version',
+            field=models.PositiveBigIntegerField(default=1),
+        ),
+        migrations.RunSQL(sql=CREATE, reverse_sql=DROP),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.8 on 2026-10-18 07:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivor', '0006_version'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='report',
+            name='gotReported',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='reported', to='survivor.survivor'),
+        ),
+        migrations.AddIndex(
+            model_name='inventory',
+            index=models.Index(fields=['owner_survivor'], include=('water', 'food', 'meds', 'ammo'), name='inventory_owner_resources_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='survivor',
+            index=models.Index(condition=models.Q(('infected', True)), fields=['id'], name='survivor_infected_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.2.8 on 2026-10-18 08:11
+
+from django.db import migrations, models
+
+# GET /changes only serves rows of transactions older than any still running
+# (survivor.changes), so a row that commits after a later id was read can not
+# be skipped by a client polling with that id as its cursor.
+XACT_ID = (
+    "ALTER TABLE survivor_change"
+    " ADD COLUMN xact_id xid8 NOT NULL DEFAULT pg_current_xact_id();"
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivor', '0007_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Change',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('survivor_id', models.BigIntegerField()),
+                ('kind', models.CharField(choices=[('created', 'created'), ('moved', 'moved'), ('traded', 'traded'), ('infected', 'infected')], max_length=10)),
+                ('data', models.JSONField(default=dict)),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=XACT_ID,
+            reverse_sql="ALTER TABLE survivor_change DROP COLUMN xact_id;",
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.8 on 2026-10-18 08:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('survivor', '0008_change'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='change',
+            name='kind',
+            field=models.CharField(choices=[('created', 'created'), ('moved', 'moved'), ('traded', 'traded'), ('infected', 'infected'), ('deleted', 'deleted')], max_length=10),
+        ),
+    ]
@@ -0,0 +1,177 @@
+import hashlib
+
+from django.http import Http404
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from survivor.caching import MISSING, fetch, object_key, peek
+
+
+def resolve(instance, path):
+    if isinstance(instance, dict):
+        return instance.get(path)
+    for name in path.split("__"):
+        instance = getattr(instance, name, None)
+    return instance
+
+
+def version_etag(versions, renderer_format):
+    # Each rendering of the same versions is a different representation.
+    return quote_etag(
+        f"{renderer_format}-" + ".".join(str(version or 0) for version in versions)
+    )
+
+
+class VersionedViewMixin:
+    """Conditional GETs answered from the rows' version columns.
+
+    Detail payloads are cached per object under "<cache_kind>:<pk>" along
+    with their versions, which make the ETag together with the format. On a
+    cache miss, the If-None-Match header is checked against the version
+    columns alone, before any row is loaded or serialized.
+    """
+
+    cache_kind = None
+    # Version columns making up the ETag, including nested relations'.
+    version_fields = ["version"]
+    # Detail of a survivor that is infected answers 400 instead.
+    infected_field = "infected"
+
+    def get_version_fields(self):
+        return self.version_fields
+
+    def load_entry(self):
+        instance = self.get_object()
+        return {
+            "versions": [resolve(instance, name) for name in self.get_version_fields()],
+            "infected": resolve(instance, self.infected_field),
+            "data": dict(self.get_serializer(instance).data),
+        }
+
+    def detail_etag(self, versions):
+        return version_etag(versions, self.request.accepted_renderer.format)
+
+    def not_modified(self, etag):
+        response = get_conditional_response(self.request, etag=etag)
+        if response is not None:
+            response["ETag"] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        pk = str(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        if not pk.isdigit():
+            raise Http404
+        name = object_key(self.cache_kind, int(pk))
+        entry = peek(name)
+        if entry is MISSING and "HTTP_IF_NONE_MATCH" in request.META:
+            row = (
+                self.get_queryset()
+                .filter(pk=pk)
+                .values_list(self.infected_field, *self.get_version_fields())
+                .first()
+            )
+            if row is None:
+                raise Http404
+            if not row[0]:
+                response = self.not_modified(self.detail_etag(row[1:]))
+                if response is not None:
+                    return response
+        if entry is MISSING:
+            entry = fetch(name, self.load_entry)
+        if entry["infected"]:
+            return Response(
+                {"error": "Selected survivor is infected"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        etag = self.detail_etag(entry["versions"])
+        response = self.not_modified(etag) or Response(entry["data"])
+        response["ETag"] = etag
+        return response
+
+    def list_etag(self, rows, has_next):
+        digest = hashlib.md5(
+            repr(
+                (
+                    self.request.get_full_path(),
+                    self.request.accepted_renderer.format,
+                    rows,
+                    has_next,
+                )
+            ).encode()
+        )
+        return quote_etag(digest.hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        fields = ["id", *self.get_version_fields()]
+        if "HTTP_IF_NONE_MATCH" in request.META:
+            paginator = self.pagination_class()
+            page = paginator.paginate_queryset(
+                self.filter_queryset(self.get_queryset()).values(*fields),
+                request,
+                view=self,
+            )
+            rows = [tuple(row[name] for name in fields) for row in page]
+            response = self.not_modified(self.list_etag(rows, paginator.has_next))
+            if response is not None:
+                return response
+        response = super().list(request, *args, **kwargs)
+        rows = [
+            tuple(resolve(instance, name) for name in fields)
+            for instance in self.paginator.page
+        ]
+        response["ETag"] = self.list_etag(rows, self.paginator.has_next)
+        return response
+
+
+class SparseFieldsViewMixin:
+    # GET ...?fields=id,latitude,longitude
+    fields_query_param = "fields"
+    # Columns loaded even when they are not requested.
+    sparse_extra_columns = []
+
+    def get_requested_fields(self):
+        if not hasattr(self, "_requested_fields"):
+            self._requested_fields = self.parse_requested_fields()
+        return self._requested_fields
+
+    def parse_requested_fields(self):
+        if self.action != "list":
+            return None
+        raw = self.request.query_params.get(self.fields_query_param)
+        if not raw:
+            return None
+        fields = list(dict.fromkeys(name.strip() for name in raw.split(",")))
+        available = self.serializer_class().fields
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            raise ValidationError(
+                {
+                    self.fields_query_param: [
+                        f"Unknown field: {name}" for name in unknown
+                    ]
+                }
+            )
+        return fields
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is None:
+            return queryset
+        opts = queryset.model._meta
+        related = [name for name in fields if not opts.get_field(name).concrete]
+        columns = [name for name in fields if name not in related]
+        return (
+            queryset.select_related(None)
+            .select_related(*related)
+            .only(opts.pk.name, *columns, *self.sparse_extra_columns)
+        )
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_requested_fields()
+        if fields is not None:
+            kwargs["fields"] = fields
+        return super().get_serializer(*args, **kwargs)
@@ -1,7 +1,8 @@
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
-from survivor.choices import GENDER_CHOICES
+from survivor.choices import CHANGE_KIND_CHOICES, GENDER_CHOICES
+from survivor.geo import grid_cell
 
 
 # Create your models here.
@@ -16,10 +17,39 @@ class Survivor(models.Model):
         validators=[MinValueValidator(-180), MaxValueValidator(180)]
     )
     infected = models.BooleanField(default=False)
+    report_count = models.PositiveIntegerField(default=0)
+    grid_cell = models.IntegerField(default=0)
+    # Bumped by a database trigger whenever the row changes (migration 0006).
+    version = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["grid_cell"],
+                include=["latitude", "longitude"],
+                condition=models.Q(infected=False),
+                name="survivor_healthy_grid_idx",
+            ),
+            models.Index(
+                fields=["id"],
+                condition=models.Q(infected=True),
+                name="survivor_infected_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.name
 
+    def update_grid_cell(self):
+        self.grid_cell = grid_cell(self.latitude, self.longitude)
+
+    def save(self, *args, **kwargs):
+        self.update_grid_cell()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"latitude", "longitude"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "grid_cell"}
+        super().save(*args, **kwargs)
+
 
 class Inventory(models.Model):
     owner_survivor = models.OneToOneField(
@@ -29,14 +59,26 @@ class Inventory(models.Model):
     food = models.IntegerField(validators=[MinValueValidator(0)])
     meds = models.IntegerField(validators=[MinValueValidator(0)])
     ammo = models.IntegerField(validators=[MinValueValidator(0)])
+    # Bumped by a database trigger whenever the row changes (migration 0006).
+    version = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["owner_survivor"],
+                include=["water", "food", "meds", "ammo"],
+                name="inventory_owner_resources_idx",
+            )
+        ]
 
     def __str__(self):
         return self.owner_survivor.name + "'s inventory"
 
 
 class Report(models.Model):
+    # Lookups by gotReported are served by unique_flag, which leads with it.
     gotReported = models.ForeignKey(
-        Survivor, on_delete=models.CASCADE, related_name="reported"
+        Survivor, on_delete=models.CASCADE, related_name="reported", db_index=False
     )
     whoReported = models.ForeignKey(
         Survivor, on_delete=models.CASCADE, related_name="reports"
@@ -51,3 +93,36 @@ class Report(models.Model):
 
     def __str__(self):
         return f"{self.gotReported} reported by {self.whoReported}"
+
+
+class Statistics(models.Model):
+    infected_count = models.BigIntegerField(default=0)
+    healthy_count = models.BigIntegerField(default=0)
+    water = models.BigIntegerField(default=0)
+    food = models.BigIntegerField(default=0)
+    meds = models.BigIntegerField(default=0)
+    ammo = models.BigIntegerField(default=0)
+    infected_water = models.BigIntegerField(default=0)
+    infected_food = models.BigIntegerField(default=0)
+    infected_meds = models.BigIntegerField(default=0)
+    infected_ammo = models.BigIntegerField(default=0)
+
+    SINGLETON_ID = 1
+
+    class Meta:
+        verbose_name_plural = "statistics"
+
+    def __str__(self):
+        return f"{self.healthy_count} survivors, {self.infected_count} infected"
+
+
+class Change(models.Model):
+    # Not a foreign key: the log outlives the survivors it mentions.
+    survivor_id = models.BigIntegerField()
+    kind = models.CharField(max_length=10, choices=CHANGE_KIND_CHOICES)
+    data = models.JSONField(default=dict)
+    # Every row also carries the id of the transaction that wrote it, in a
+    # column filled by the database (migration 0008).
+
+    def __str__(self):
+        return f"#{self.pk} {self.kind} survivor {self.survivor_id}"
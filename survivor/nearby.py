@@ -0,0 +1,45 @@
+import math
+from functools import reduce
+from operator import or_
+
+from django.db.models import F, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+from survivor.geo import EARTH_RADIUS_KM, bounding_box, grid_cells
+from survivor.models import Survivor
+
+
+def distance_km(latitude, longitude):
+    """SQL haversine distance from a point to each survivor, in kilometers."""
+    half_latitude = Radians(F("latitude") - Value(latitude)) / Value(2.0)
+    half_longitude = Radians(F("longitude") - Value(longitude)) / Value(2.0)
+    a = Power(Sin(half_latitude), Value(2.0)) + Cos(Radians(F("latitude"))) * Value(
+        math.cos(math.radians(latitude))
+    ) * Power(Sin(half_longitude), Value(2.0))
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(a, Value(1.0))))
+
+
+def nearby_survivors(latitude, longitude, radius_km):
+    """Healthy survivors within radius_km of a point, closest first.
+
+    The bounding box is turned into grid cells to hit the partial grid index,
+    then the exact haversine distance is computed and filtered in SQL.
+    """
+    min_latitude, max_latitude, longitude_ranges = bounding_box(
+        latitude, longitude, radius_km
+    )
+    queryset = Survivor.objects.filter(
+        infected=False, latitude__range=(min_latitude, max_latitude)
+    )
+    cells = grid_cells(min_latitude, max_latitude, longitude_ranges)
+    if cells is not None:
+        queryset = queryset.filter(grid_cell__in=cells)
+    if longitude_ranges != [(-180, 180)]:
+        queryset = queryset.filter(
+            reduce(or_, [Q(longitude__range=bounds) for bounds in longitude_ranges])
+        )
+    return (
+        queryset.annotate(distance=distance_km(latitude, longitude))
+        .filter(distance__lte=radius_km)
+        .order_by("distance", "id")
+    )
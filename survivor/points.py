@@ -0,0 +1,9 @@
+from decouple import config
+
+PTS_WATER = int(config("PTS_WATER"))
+PTS_FOOD = int(config("PTS_FOOD"))
+PTS_MEDS = int(config("PTS_MEDS"))
+PTS_AMMO = int(config("PTS_AMMO"))
+
+RESOURCES = ["water", "food", "meds", "ammo"]
+POINTS = {"water": PTS_WATER, "food": PTS_FOOD, "meds": PTS_MEDS, "ammo": PTS_AMMO}
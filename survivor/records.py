@@ -0,0 +1,65 @@
+from django.db import connection, transaction
+from django.db.models import Count, Q, Sum
+
+from survivor.models import Inventory, Statistics, Survivor
+from survivor.points import POINTS, RESOURCES
+
+COUNTERS = [
+    "infected_count",
+    "healthy_count",
+    *RESOURCES,
+    *[f"infected_{resource}" for resource in RESOURCES],
+]
+
+
+def count_record():
+    infected = Q(infected=True)
+    aggregates = {
+        "infected_count": Count("id", filter=infected),
+        "healthy_count": Count("id", filter=Q(infected=False)),
+    }
+    for resource in RESOURCES:
+        aggregates[resource] = Sum(f"inventory__{resource}")
+        aggregates[f"infected_{resource}"] = Sum(
+            f"inventory__{resource}", filter=infected
+        )
+    totals = Survivor.objects.aggregate(**aggregates)
+    return {key: value or 0 for key, value in totals.items()}
+
+
+def load_record():
+    totals = (
+        Statistics.objects.filter(pk=Statistics.SINGLETON_ID).values(*COUNTERS).first()
+    )
+    return totals or dict.fromkeys(COUNTERS, 0)
+
+
+def rebuild_record():
+    """Recount the statistics row from scratch, returning (stored, recounted)."""
+    with transaction.atomic():
+        tables = ", ".join(
+            model._meta.db_table for model in [Survivor, Inventory, Statistics]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {tables} IN SHARE ROW EXCLUSIVE MODE")
+        stored = load_record()
+        totals = count_record()
+        Statistics.objects.update_or_create(pk=Statistics.SINGLETON_ID, defaults=totals)
+    return stored, totals
+
+
+def build_record(totals):
+    if totals["healthy_count"] == 0:
+        return None
+    total = totals["infected_count"] + totals["healthy_count"]
+    infected_percent = (totals["infected_count"] / total) * 100
+    record = {
+        "infected_percent": infected_percent,
+        "survivors_percent": 100 - infected_percent,
+    }
+    for resource in RESOURCES:
+        record[f"avg_{resource}"] = totals[resource] / total
+    record["lostpt"] = sum(
+        totals[f"infected_{resource}"] * POINTS[resource] for resource in RESOURCES
+    )
+    return record
@@ -0,0 +1,138 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from survivor.caching import invalidate_owners
+from survivor.changes import record_infections
+from survivor.metrics import count_infections, count_reports
+from survivor.models import Report, Survivor
+
+INFECTION_THRESHOLD = 3
+ALREADY_REPORTED = "Survivor was already reported by this reporter"
+
+
+def add_report(survivor_id):
+    """Count one more report against a survivor.
+
+    Returns True when this report is the one that flags the survivor as
+    infected. The flip is a single conditional UPDATE, so concurrent reports
+    can neither miss the threshold nor flip the survivor twice.
+    """
+    Survivor.objects.filter(pk=survivor_id).update(report_count=F("report_count") + 1)
+    count_reports(1)
+    return bool(flag_infected([survivor_id]))
+
+
+def flag_infected(survivor_ids):
+    """Flag the given survivors as infected if they reached the threshold.
+
+    Returns the ids of the survivors flagged by this call.
+    """
+    with connection.cursor() as cursor:
+        # UPDATE ... RETURNING, as the flips go to the change log.
+        cursor.execute(
+            f"UPDATE {connection.ops.quote_name(Survivor._meta.db_table)}"
+            " SET infected = true"
+            " WHERE id = ANY(%s) AND NOT infected AND report_count >= %s"
+            " RETURNING id",
+            [list(survivor_ids), INFECTION_THRESHOLD],
+        )
+        flagged = [row[0] for row in cursor.fetchall()]
+    if flagged:
+        record_infections(flagged)
+        invalidate_owners(survivor_ids, record=True)
+        count_infections(len(flagged))
+    return flagged
+
+
+def recount_reports(survivor_ids):
+    """Recompute report_count from the Report table for the given survivors."""
+    counts = (
+        Report.objects.filter(gotReported=OuterRef("pk"))
+        .order_by()
+        .values("gotReported")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Survivor.objects.filter(pk__in=survivor_ids).update(
+        report_count=Coalesce(Subquery(counts), 0)
+    )
+
+
+def _insert_reports(pairs):
+    """INSERT the pairs, skipping those already filed.
+
+    Returns the pairs that were actually inserted.
+    """
+    table = connection.ops.quote_name(Report._meta.db_table)
+    columns = ", ".join(
+        connection.ops.quote_name(Report._meta.get_field(name).column)
+        for name in ("gotReported", "whoReported")
+    )
+    inserted = set()
+    with connection.cursor() as cursor:
+        for start in range(0, len(pairs), settings.BULK_BATCH_SIZE):
+            batch = pairs[start : start + settings.BULK_BATCH_SIZE]
+            cursor.execute(
+                f"INSERT INTO {table} ({columns})"
+                f" VALUES {', '.join(['(%s, %s)'] * len(batch))}"
+                f" ON CONFLICT DO NOTHING RETURNING {columns}",
+                [value for pair in batch for value in pair],
+            )
+            inserted.update(cursor.fetchall())
+    return inserted
+
+
+def file_reports(pairs):
+    """Record many (gotReported, whoReported) reports at once.
+
+    Referenced survivors and already filed pairs are loaded with one query
+    each and every report is validated in memory. Accepted reports are
+    inserted in bulk, after which the counters and infection flags of the
+    reported survivors are recomputed set-based. Pairs filed concurrently
+    between the check and the insert are reported as already filed.
+    Returns the per-index errors, the number of inserted reports and the
+    ids of the survivors that just got flagged as infected.
+    """
+    survivor_ids = {survivor_id for pair in pairs for survivor_id in pair}
+    infected = dict(
+        Survivor.objects.filter(pk__in=survivor_ids).values_list("pk", "infected")
+    )
+    seen = set(
+        Report.objects.filter(
+            gotReported__in={reported for reported, _ in pairs},
+            whoReported__in={reporter for _, reporter in pairs},
+        ).values_list("gotReported", "whoReported")
+    )
+    accepted, errors = {}, []
+    for index, (reported, reporter) in enumerate(pairs):
+        if reported not in infected or reporter not in infected:
+            error = "Survivor not found"
+        elif infected[reporter]:
+            error = "Infected Survivor can't report"
+        elif (reported, reporter) in seen:
+            error = ALREADY_REPORTED
+        else:
+            seen.add((reported, reporter))
+            accepted[reported, reporter] = index
+            continue
+        errors.append({"index": index, "errors": {"error": error}})
+    if not accepted:
+        return errors, 0, []
+    with transaction.atomic():
+        inserted = _insert_reports(list(accepted))
+        reported_ids = {reported for reported, _ in inserted}
+        if reported_ids:
+            recount_reports(reported_ids)
+            flipped = flag_infected(reported_ids)
+        else:
+            flipped = []
+        count_reports(len(inserted))
+    errors += [
+        {"index": index, "errors": {"error": ALREADY_REPORTED}}
+        for pair, index in accepted.items()
+        if pair not in inserted
+    ]
+    errors.sort(key=lambda error: error["index"])
+    return errors, len(inserted), flipped
@@ -1,23 +1,75 @@
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 
+from survivor.changes import record_created
+from survivor.export import EXPORT_FORMATS
 from survivor.models import Inventory, Report, Survivor
+from survivor.points import RESOURCES
+from survivor.reporting import add_report, flag_infected, recount_reports
 
 
-class InventorySerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class InventorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Inventory
-        fields = "__all__"
+        exclude = ["version"]
 
 
 class InventoryCreatorSerializer(serializers.ModelSerializer):
     class Meta:
         model = Inventory
-        exclude = ["id", "owner_survivor"]
+        exclude = ["id", "owner_survivor", "version"]
+
+
+class BulkListSerializer(serializers.ListSerializer):
+    def validate_each(self, data):
+        """Validate every item on its own, returning (valid items, errors).
+
+        Valid items are returned as (index, validated data) pairs.
+        """
+        valid, errors = [], []
+        for index, item in enumerate(data):
+            try:
+                valid.append((index, self.child.run_validation(item)))
+            except ValidationError as exc:
+                errors.append({"index": index, "errors": exc.detail})
+        return valid, errors
+
+
+class SurvivorListSerializer(BulkListSerializer):
+    def create(self, validated_data):
+        survivors, inventories = [], []
+        for attrs in validated_data:
+            attrs = dict(attrs)
+            inventories.append(attrs.pop("inventory"))
+            survivor = Survivor(**attrs)
+            survivor.update_grid_cell()
+            survivors.append(survivor)
+        inventories = [
+            Inventory(owner_survivor=survivor, **inv)
+            for survivor, inv in zip(survivors, inventories)
+        ]
+        with transaction.atomic():
+            Survivor.objects.bulk_create(survivors, batch_size=settings.BULK_BATCH_SIZE)
+            Inventory.objects.bulk_create(
+                inventories, batch_size=settings.BULK_BATCH_SIZE
+            )
+            record_created(survivors)
+        return survivors
 
 
-class SurvivorSerializer(serializers.ModelSerializer):
+class SurvivorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     inventory = InventoryCreatorSerializer()
 
     class Meta:
@@ -33,14 +85,92 @@ class SurvivorSerializer(serializers.ModelSerializer):
             "inventory",
         ]
         read_only_fields = ["infected"]
+        list_serializer_class = SurvivorListSerializer
 
     def create(self, validated_data):
         inv = validated_data.pop("inventory")
-        survivor = Survivor.objects.create(**validated_data)
-        Inventory.objects.create(owner_survivor=survivor, **inv)
+        with transaction.atomic():
+            survivor = Survivor.objects.create(**validated_data)
+            Inventory.objects.create(owner_survivor=survivor, **inv)
+            record_created([survivor])
         return survivor
 
 
+class SurvivorReadSerializer(serializers.BaseSerializer):
+    """Read-only twin of SurvivorSerializer for rows of .values().
+
+    Builds the same representation straight from the joined survivor and
+    inventory columns, skipping per-field introspection. Writes and
+    validation keep going through SurvivorSerializer.
+    """
+
+    survivor_fields = [
+        name for name in SurvivorSerializer.Meta.fields if name != "inventory"
+    ]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            self.survivor_fields = [
+                name for name in self.survivor_fields if name in fields
+            ]
+        self.with_inventory = fields is None or "inventory" in fields
+
+    @classmethod
+    def columns(cls, fields=None):
+        columns = [
+            name for name in cls.survivor_fields if fields is None or name in fields
+        ]
+        if fields is None or "inventory" in fields:
+            columns += ["inventory__id"]
+            columns += [f"inventory__{resource}" for resource in RESOURCES]
+        return columns
+
+    def to_representation(self, row):
+        data = {name: row[name] for name in self.survivor_fields}
+        if self.with_inventory:
+            data["inventory"] = (
+                None
+                if row["inventory__id"] is None
+                else {resource: row[f"inventory__{resource}"] for resource in RESOURCES}
+            )
+        return data
+
+
+class ExportSerializer(serializers.Serializer):
+    output = serializers.ChoiceField(choices=list(EXPORT_FORMATS), default="ndjson")
+    infected = serializers.BooleanField(required=False, allow_null=True, default=None)
+    min_id = serializers.IntegerField(required=False, min_value=1)
+    max_id = serializers.IntegerField(required=False, min_value=1)
+
+
+class ChangesSerializer(serializers.Serializer):
+    since = serializers.IntegerField(min_value=0, default=0)
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.API_MAX_PAGE_SIZE,
+        default=settings.API_PAGE_SIZE,
+    )
+
+
+class NearbySurvivorSerializer(SurvivorSerializer):
+    distance = serializers.FloatField(read_only=True)
+
+    class Meta(SurvivorSerializer.Meta):
+        fields = SurvivorSerializer.Meta.fields + ["distance"]
+
+
+class NearbySerializer(serializers.Serializer):
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lon = serializers.FloatField(min_value=-180, max_value=180)
+    radius = serializers.FloatField(
+        min_value=0, max_value=settings.NEARBY_MAX_RADIUS_KM
+    )
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.NEARBY_MAX_LIMIT, default=10
+    )
+
+
 class LocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Survivor
@@ -48,7 +178,7 @@ class LocationSerializer(serializers.ModelSerializer):
 
 
 class TradeSerializer(serializers.Serializer):
-    id = serializers.PrimaryKeyRelatedField(queryset=Survivor.objects.all())
+    id = serializers.IntegerField(min_value=1)
     trd_water = serializers.IntegerField(min_value=0)
     trd_food = serializers.IntegerField(min_value=0)
     trd_meds = serializers.IntegerField(min_value=0)
@@ -59,6 +189,9 @@ class ExchangeSerializer(serializers.Serializer):
     trader_1 = TradeSerializer()
     trader_2 = TradeSerializer()
 
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
 
 class ReportSerializer(serializers.ModelSerializer):
     class Meta:
@@ -78,13 +211,35 @@ class ReportSerializer(serializers.ModelSerializer):
         return value
 
     def create(self, validated_data):
-        instance = super().create(validated_data)
-        reported = validated_data["gotReported"]
-        if not reported.infected and reported.reported.count() >= 3:
-            reported.infected = True
-            reported.save(update_fields=["infected"])
+        with transaction.atomic():
+            instance = super().create(validated_data)
+            reported = validated_data["gotReported"]
+            if add_report(reported.pk):
+                reported.infected = True
         return instance
 
+    def update(self, instance, validated_data):
+        reported_ids = {instance.gotReported_id}
+        with transaction.atomic():
+            instance = super().update(instance, validated_data)
+            reported_ids.add(instance.gotReported_id)
+            recount_reports(reported_ids)
+            flag_infected(reported_ids)
+        return instance
+
+
+class BulkReportSerializer(serializers.Serializer):
+    gotReported = serializers.IntegerField(min_value=1)
+    whoReported = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        list_serializer_class = BulkListSerializer
+
+    def validate(self, attrs):
+        if attrs["gotReported"] == attrs["whoReported"]:
+            raise ValidationError({"error": "Survivor can't report itself"})
+        return attrs
+
 
 class RecordSerializer(serializers.Serializer):
     infected_percent = serializers.DecimalField(
@@ -0,0 +1,35 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test.testcases import TestCase
+
+from survivor.models import Survivor
+
+
+class ExplainQueriesTest(TestCase):
+    def test_no_sequential_scan(self):
+        out = StringIO()
+        # More rows than the threshold, so a missing index shows up.
+        call_command(
+            "explain_queries", "--seed", "3000", "--threshold", "1000", stdout=out
+        )
+        self.assertIn("GET /Survivor/nearby", out.getvalue())
+        self.assertIn("No sequential scan", out.getvalue())
+        self.assertEqual(Survivor.objects.count(), 0)
+
+    def test_sequential_scan_above_threshold(self):
+        with self.assertRaises(CommandError):
+            call_command(
+                "explain_queries",
+                "--seed",
+                "200",
+                "--threshold",
+                "0",
+                stdout=StringIO(),
+                stderr=StringIO(),
+            )
+
+    def test_needs_survivors(self):
+        with self.assertRaises(CommandError):
+            call_command("explain_queries", stdout=StringIO())
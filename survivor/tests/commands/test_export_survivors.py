@@ -0,0 +1,42 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test.testcases import TestCase
+
+from survivor.tests.factories.inventory import InventoryFactory
+
+
+class ExportSurvivorsTest(TestCase):
+    def setUp(self):
+        self.inventories = InventoryFactory.create_batch(
+            5, owner_survivor__infected=False
+        )
+        InventoryFactory(owner_survivor__infected=True)
+
+    def test_export_ndjson(self):
+        out = StringIO()
+        call_command("export_survivors", "--chunk-size", "2", stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]["inventory"]["ammo"], self.inventories[0].ammo)
+
+    def test_export_resume(self):
+        out = StringIO()
+        min_id = self.inventories[3].owner_survivor.id
+        call_command(
+            "export_survivors",
+            "--format",
+            "csv",
+            "--infected",
+            "false",
+            "--min-id",
+            str(min_id),
+            stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        self.assertEqual(
+            lines[0],
+            "id,name,age,gender,longitude,latitude,infected,water,food,meds,ammo",
+        )
+        self.assertEqual(len(lines), 3)
@@ -0,0 +1,33 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test.testcases import TestCase
+
+from survivor.models import Statistics
+from survivor.records import count_record, load_record
+from survivor.tests.factories.inventory import InventoryFactory
+
+
+class RebuildStatisticsTest(TestCase):
+    def setUp(self):
+        InventoryFactory.create_batch(5, owner_survivor__infected=False)
+        InventoryFactory.create_batch(3, owner_survivor__infected=True)
+
+    def test_statistics_follow_writes(self):
+        self.assertEqual(load_record(), count_record())
+
+    def test_check_passes(self):
+        out = StringIO()
+        call_command("rebuild_statistics", "--check", stdout=out)
+        self.assertIn("match", out.getvalue())
+
+    def test_check_detects_drift(self):
+        Statistics.objects.update(healthy_count=0)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_statistics", "--check", stderr=StringIO())
+
+    def test_rebuild_fixes_drift(self):
+        Statistics.objects.all().delete()
+        call_command("rebuild_statistics", stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(load_record(), count_record())
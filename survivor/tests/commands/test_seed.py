@@ -0,0 +1,65 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test.testcases import TestCase
+
+from survivor.geo import grid_cell
+from survivor.models import Inventory, Report, Survivor
+from survivor.reporting import INFECTION_THRESHOLD
+
+
+class SeedTest(TestCase):
+    def seed(self, *args):
+        call_command("seed", *args, stdout=StringIO())
+
+    def test_seed(self):
+        self.seed("500", "--seed", "1", "--chunk-size", "64")
+        self.assertEqual(Survivor.objects.count(), 500)
+        self.assertEqual(Inventory.objects.count(), 500)
+        infected = Survivor.objects.filter(infected=True).count()
+        self.assertTrue(10 < infected < 100)
+        for survivor in Survivor.objects.select_related("inventory"):
+            survivor.full_clean()
+            survivor.inventory.full_clean()
+            self.assertEqual(
+                survivor.grid_cell, grid_cell(survivor.latitude, survivor.longitude)
+            )
+            self.assertEqual(
+                survivor.infected, survivor.report_count >= INFECTION_THRESHOLD
+            )
+        counts = dict(
+            Report.objects.values_list("gotReported").annotate(total=Count("pk"))
+        )
+        for survivor_id, report_count in Survivor.objects.values_list(
+            "id", "report_count"
+        ):
+            self.assertEqual(counts.get(survivor_id, 0), report_count)
+        reports = Report.objects.select_related("whoReported")
+        self.assertFalse(any(r.gotReported_id == r.whoReported_id for r in reports))
+        self.assertFalse(any(r.whoReported.infected for r in reports))
+        call_command("rebuild_statistics", "--check", stdout=StringIO())
+
+    def test_same_seed_same_population(self):
+        def population():
+            return list(
+                Survivor.objects.order_by("id").values_list(
+                    "name", "age", "gender", "latitude", "longitude", "infected"
+                )
+            )
+
+        self.seed("50", "--seed", "7")
+        first = population()
+        Survivor.objects.all().delete()
+        self.seed("50", "--seed", "7")
+        self.assertEqual(population(), first)
+        Survivor.objects.all().delete()
+        self.seed("50", "--seed", "8")
+        self.assertNotEqual(population(), first)
+
+    def test_invalid(self):
+        with self.assertRaises(CommandError):
+            self.seed("0")
+        with self.assertRaises(CommandError):
+            self.seed("10", "--infected", "1")
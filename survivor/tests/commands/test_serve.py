@@ -0,0 +1,36 @@
+import os
+import sys
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class ServeTest(SimpleTestCase):
+    def test_wsgi(self):
+        with mock.patch("os.execv") as execv:
+            call_command("serve", "--", "--workers", "2")
+        executable, argv = execv.call_args[0]
+        self.assertEqual(executable, sys.executable)
+        self.assertEqual(argv[1:3], ["-m", "gunicorn"])
+        self.assertIn(str(settings.BASE_DIR / "gunicorn.conf.py"), argv)
+        self.assertEqual(argv[-3:], ["--workers", "2", "ZSSN.wsgi:application"])
+
+    def test_asgi(self):
+        with mock.patch("os.execv") as execv:
+            call_command("serve", "--asgi")
+        argv = execv.call_args[0][1]
+        self.assertIn("uvicorn.workers.UvicornWorker", argv)
+        self.assertEqual(argv[-1], "ZSSN.asgi:application")
+
+    def test_metrics_dir(self):
+        with tempfile.TemporaryDirectory() as metrics_dir:
+            for name in ("counter_1.db", "notes.txt"):
+                open(os.path.join(metrics_dir, name), "w").close()
+            with mock.patch.dict(
+                os.environ, PROMETHEUS_MULTIPROC_DIR=metrics_dir
+            ), mock.patch("os.execv"):
+                call_command("serve")
+            self.assertEqual(os.listdir(metrics_dir), ["notes.txt"])
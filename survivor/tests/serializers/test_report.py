@@ -1,7 +1,10 @@
-from django.test.testcases import TestCase
+import threading
+
+from django.db import connection
+from django.test.testcases import TestCase, TransactionTestCase
 from rest_framework.exceptions import ValidationError
 
-from survivor.models import Report
+from survivor.models import Report, Survivor
 from survivor.serializers import ReportSerializer
 from survivor.tests.factories.report import ReportFactory
 from survivor.tests.factories.survivor import SurvivorFactory
@@ -33,3 +36,61 @@ class ReportSerializerTest(TestCase):
         data = ReportSerializer(self.report).data
         self.assertEqual(self.report.gotReported.id, data["gotReported"])
         self.assertEqual(self.report.whoReported.id, data["whoReported"])
+
+    def test_create_report_counts(self):
+        reporters = SurvivorFactory.create_batch(3, infected=False)
+        for index, reporter in enumerate(reporters):
+            data = {"gotReported": self.survivor.id, "whoReported": reporter.id}
+            serializer = ReportSerializer(data=data)
+            serializer.is_valid(raise_exception=True)
+            with self.assertNumQueries(7 if index == 2 else 5):
+                serializer.save()
+            self.survivor.refresh_from_db()
+            self.assertEqual(self.survivor.report_count, index + 1)
+            self.assertEqual(self.survivor.infected, index == 2)
+
+    def test_update_report_recounts(self):
+        reports = [
+            ReportFactory(gotReported=self.survivor, whoReported=reporter)
+            for reporter in SurvivorFactory.create_batch(3, infected=False)
+        ]
+        data = {"gotReported": self.survivor_2.id, "whoReported": self.survivor.id}
+        serializer = ReportSerializer(reports[0], data=data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        self.survivor.refresh_from_db()
+        self.survivor_2.refresh_from_db()
+        self.assertEqual(self.survivor.report_count, 2)
+        self.assertEqual(self.survivor_2.report_count, 1)
+
+
+class ConcurrentReportTest(TransactionTestCase):
+    def report(self, reported, reporter, errors):
+        try:
+            serializer = ReportSerializer(
+                data={"gotReported": reported.id, "whoReported": reporter.id}
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def test_concurrent_reports(self):
+        reported = SurvivorFactory(infected=False)
+        reporters = SurvivorFactory.create_batch(8, infected=False)
+        errors = []
+        workers = [
+            threading.Thread(target=self.report, args=(reported, reporter, errors))
+            for reporter in reporters
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+        reported.refresh_from_db()
+        self.assertEqual(reported.report_count, len(reporters))
+        self.assertTrue(reported.infected)
+        self.assertEqual(Survivor.objects.filter(infected=True).count(), 1)
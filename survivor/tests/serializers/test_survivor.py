@@ -1,9 +1,11 @@
 from django.test.testcases import TestCase
 from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 
 from survivor.choices import FEMALE
 from survivor.models import Survivor
-from survivor.serializers import SurvivorSerializer
+from survivor.serializers import SurvivorReadSerializer, SurvivorSerializer
+from survivor.tests.factories.inventory import InventoryFactory
 from survivor.tests.factories.survivor import SurvivorFactory
 
 
@@ -53,3 +55,14 @@ class SurvivorSerializerTest(TestCase):
         self.assertEqual(self.survivor.longitude, data["longitude"])
         self.assertFalse(data["infected"])
         self.assertEqual(data["inventory"], None)
+
+    def test_read_serializer_matches(self):
+        InventoryFactory.create_batch(3, owner_survivor__name="Zoë ☣")
+        queryset = Survivor.objects.select_related("inventory").order_by("id")
+        for fields in [None, ["id", "latitude", "inventory"], ["name"]]:
+            expected = SurvivorSerializer(queryset, many=True, fields=fields).data
+            rows = queryset.values(*SurvivorReadSerializer.columns(fields))
+            data = SurvivorReadSerializer(rows, many=True, fields=fields).data
+            self.assertEqual(
+                JSONRenderer().render(data), JSONRenderer().render(expected)
+            )
@@ -0,0 +1,51 @@
+import threading
+
+from django.db import connection, transaction
+from django.test.testcases import TestCase, TransactionTestCase
+
+from survivor.changes import changes_since, record_infections, record_moves
+from survivor.choices import INFECTED, MOVED
+
+
+class ChangesSinceTest(TestCase):
+    def test_paging(self):
+        record_moves({1: (10.0, 20.0), 2: (-5.0, 0.5)})
+        record_infections([3])
+        changes, more = changes_since(0, 2)
+        self.assertTrue(more)
+        self.assertEqual(
+            [(change["survivor"], change["kind"]) for change in changes],
+            [(1, MOVED), (2, MOVED)],
+        )
+        self.assertEqual(changes[1]["latitude"], -5.0)
+        changes, more = changes_since(changes[-1]["id"], 2)
+        self.assertFalse(more)
+        self.assertEqual(
+            changes, [{"id": changes[0]["id"], "survivor": 3, "kind": INFECTED}]
+        )
+
+
+class UnsettledChangesTest(TransactionTestCase):
+    def test_running_transaction_holds_back_later_changes(self):
+        started, finish = threading.Event(), threading.Event()
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    record_infections([1])
+                    started.set()
+                    finish.wait(5)
+            finally:
+                connection.close()
+
+        writer = threading.Thread(target=slow_writer)
+        writer.start()
+        started.wait(5)
+        # Committed after the slow writer took a lower id: serving it now
+        # would move cursors past the slow writer's change for good.
+        record_infections([2])
+        self.assertEqual(changes_since(0, 10), ([], False))
+        finish.set()
+        writer.join()
+        changes, _ = changes_since(0, 10)
+        self.assertEqual([change["survivor"] for change in changes], [1, 2])
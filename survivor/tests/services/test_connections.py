@@ -0,0 +1,27 @@
+from unittest import mock
+
+from django.db import connection, transaction
+from django.test import TransactionTestCase
+
+from survivor.connections import check_connections
+
+
+class CheckConnectionsTest(TransactionTestCase):
+    def test_closes_dead_connection(self):
+        connection.ensure_connection()
+        with mock.patch.object(connection, "is_usable", return_value=False):
+            check_connections()
+        self.assertIsNone(connection.connection)
+
+    def test_keeps_live_connection(self):
+        connection.ensure_connection()
+        raw = connection.connection
+        check_connections()
+        self.assertIs(connection.connection, raw)
+
+    def test_leaves_transactions_alone(self):
+        with transaction.atomic():
+            connection.ensure_connection()
+            with mock.patch.object(connection, "is_usable", return_value=False):
+                check_connections()
+            self.assertIsNotNone(connection.connection)
@@ -0,0 +1,38 @@
+from django.test import SimpleTestCase
+
+from survivor.geo import (
+    GRID_COLUMNS,
+    bounding_box,
+    grid_cell,
+    grid_cells,
+    haversine,
+)
+
+
+class GeoTest(SimpleTestCase):
+    def test_grid_cell_bounds(self):
+        self.assertEqual(grid_cell(-90, -180), 0)
+        self.assertEqual(grid_cell(90, 180), 360 * GRID_COLUMNS - 1)
+        self.assertEqual(grid_cell(0.25, 0.25), 180 * GRID_COLUMNS + 360)
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine(0, 0, 0, 1), 111.195, places=2)
+        self.assertAlmostEqual(haversine(10, 179.9, 10, -179.95), 16.43, places=1)
+
+    def test_bounding_box_antimeridian(self):
+        _, _, ranges = bounding_box(10, 179.9, 50)
+        self.assertEqual(len(ranges), 2)
+        self.assertEqual(ranges[0][1], 180)
+        self.assertEqual(ranges[1][0], -180)
+
+    def test_bounding_box_pole(self):
+        min_latitude, max_latitude, ranges = bounding_box(89.9, 0, 50)
+        self.assertEqual(max_latitude, 90)
+        self.assertEqual(ranges, [(-180, 180)])
+
+    def test_grid_cells_cover_box(self):
+        box = bounding_box(45, 45, 100)
+        cells = grid_cells(*box)
+        self.assertIn(grid_cell(45, 45), cells)
+        self.assertIn(grid_cell(45.8, 45.8), cells)
+        self.assertIsNone(grid_cells(-90, 90, [(-180, 180)]))
@@ -0,0 +1,98 @@
+import random
+import threading
+
+from django.db import connection
+from django.db.models import Sum
+from django.test.testcases import TestCase, TransactionTestCase
+
+from survivor.models import Inventory
+from survivor.points import RESOURCES
+from survivor.tests.factories.inventory import InventoryFactory
+from survivor.trading import INSUFFICIENT, TradeError, execute_trade
+
+
+def offer(inventory, water=0, food=0, meds=0, ammo=0):
+    return {
+        "id": inventory.owner_survivor_id,
+        "trd_water": water,
+        "trd_food": food,
+        "trd_meds": meds,
+        "trd_ammo": ammo,
+    }
+
+
+class TradeTest(TestCase):
+    def setUp(self):
+        self.inventory_1 = InventoryFactory(
+            owner_survivor__infected=False, water=5, food=5, meds=5, ammo=5
+        )
+        self.inventory_2 = InventoryFactory(
+            owner_survivor__infected=False, water=5, food=5, meds=5, ammo=5
+        )
+
+    def test_trade_queries(self):
+        with self.assertNumQueries(5):
+            inventories = execute_trade(
+                offer(self.inventory_1, water=1), offer(self.inventory_2, meds=2)
+            )
+        self.assertEqual([inventory.water for inventory in inventories], [4, 6])
+        self.inventory_2.refresh_from_db()
+        self.assertEqual(self.inventory_2.meds, 3)
+
+    def test_trade_insufficient(self):
+        with self.assertRaises(TradeError) as ctx:
+            execute_trade(
+                offer(self.inventory_1, ammo=8), offer(self.inventory_2, meds=4)
+            )
+        self.assertEqual(ctx.exception.reason, INSUFFICIENT)
+        self.inventory_1.refresh_from_db()
+        self.assertEqual(self.inventory_1.ammo, 5)
+
+
+class ConcurrentTradeTest(TransactionTestCase):
+    threads = 8
+    trades_per_thread = 25
+
+    def setUp(self):
+        self.inventories = InventoryFactory.create_batch(
+            4, owner_survivor__infected=False, water=20, food=20, meds=20, ammo=20
+        )
+
+    def totals(self):
+        return Inventory.objects.aggregate(*[Sum(name) for name in RESOURCES])
+
+    def trade_randomly(self, seed, errors):
+        rng = random.Random(seed)
+        try:
+            for _ in range(self.trades_per_thread):
+                inventory_1, inventory_2 = rng.sample(self.inventories, 2)
+                amount = rng.randint(1, 5)
+                try:
+                    execute_trade(
+                        offer(inventory_1, water=amount),
+                        offer(inventory_2, meds=amount * 2),
+                    )
+                except TradeError as exc:
+                    if exc.reason != INSUFFICIENT:
+                        raise
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def test_concurrent_trades_conserve_resources(self):
+        before = self.totals()
+        errors = []
+        workers = [
+            threading.Thread(target=self.trade_randomly, args=(seed, errors))
+            for seed in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(self.totals(), before)
+        for inventory in Inventory.objects.all():
+            for name in RESOURCES:
+                self.assertGreaterEqual(getattr(inventory, name), 0)
@@ -0,0 +1,89 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+from urllib.parse import urlencode
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from survivor.tests.factories.inventory import InventoryFactory
+
+
+class AsyncSurvivorViewsTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        # The views query from the pool threads, which need their connections
+        # closed before the test database can be dropped.
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        patcher = mock.patch("survivor.async_views.EXECUTOR", self.executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.executor.shutdown)
+        self.addCleanup(lambda: self.executor.submit(connections.close_all).result())
+        self.inventories = InventoryFactory.create_batch(
+            3,
+            owner_survivor__infected=False,
+            owner_survivor__latitude=0,
+            water=4,
+            food=3,
+            meds=2,
+            ammo=1,
+        )
+
+    def urls(self):
+        survivor = self.inventories[0].owner_survivor
+        return [
+            ("survivor-list", {}, {"page_size": 2}),
+            ("survivor-detail", {"pk": survivor.pk}, {}),
+            ("survivor-record", {}, {}),
+            (
+                "survivor-nearby",
+                {},
+                {"lat": 0, "lon": survivor.longitude, "radius": 50},
+            ),
+        ]
+
+    async def test_same_responses_as_sync_views(self):
+        for name, kwargs, params in self.urls():
+            with self.subTest(name=name):
+                # Django 3.2's AsyncClient drops the data of GET requests.
+                resp = await self.async_client.get(
+                    f"{reverse(f'async-{name}', kwargs=kwargs)}?{urlencode(params)}"
+                )
+                self.assertEqual(resp.status_code, 200)
+                expected = await sync_to_async(self.client.get)(
+                    reverse(name, kwargs=kwargs), params
+                )
+                self.assertEqual(
+                    resp.content.replace(b"/async/", b"/"), expected.content
+                )
+
+    async def test_not_modified(self):
+        url = reverse(
+            "async-survivor-detail",
+            kwargs={"pk": self.inventories[0].owner_survivor.pk},
+        )
+        resp = await self.async_client.get(url)
+        resp = await self.async_client.get(url, **{"If-None-Match": resp["ETag"]})
+        self.assertEqual(resp.status_code, 304)
+
+    async def test_concurrent_requests(self):
+        urls = [
+            reverse("async-survivor-detail", kwargs={"pk": inventory.owner_survivor.pk})
+            for inventory in self.inventories
+        ]
+        responses = await asyncio.gather(*[self.async_client.get(url) for url in urls])
+        self.assertEqual(
+            [resp.json()["id"] for resp in responses],
+            [inventory.owner_survivor.pk for inventory in self.inventories],
+        )
+
+    async def test_invalid_nearby(self):
+        resp = await self.async_client.get(
+            f"{reverse('async-survivor-nearby')}?lat=95&lon=0&radius=10"
+        )
+        self.assertIn("lat", resp.json())
+        self.assertEqual(resp.status_code, 400)
@@ -0,0 +1,117 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APITestCase
+
+from survivor.choices import CREATED, DELETED, FEMALE, INFECTED, MOVED, TRADED
+from survivor.models import Change
+from survivor.points import POINTS
+from survivor.tests.factories.survivor import SurvivorFactory
+
+
+class ChangeViewSetTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.list_url = reverse("change-list")
+
+    def create(self, name):
+        data = {
+            "name": name,
+            "age": 25,
+            "gender": FEMALE,
+            "latitude": 50,
+            "longitude": 50,
+            "inventory": {"water": 10, "food": 10, "meds": 10, "ammo": 10},
+        }
+        resp = self.client.post(reverse("survivor-list"), data, format="json")
+        return resp.json()["id"]
+
+    def changes(self, since=0):
+        resp = self.client.get(self.list_url, {"since": since})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        return resp.json()
+
+    def test_feed(self):
+        first, second = self.create("First"), self.create("Second")
+        self.client.patch(
+            reverse("survivor-detail", kwargs={"pk": first}),
+            {"latitude": -10, "longitude": 20},
+            format="json",
+        )
+        trade = {
+            "trader_1": {"id": first, "trd_water": POINTS["meds"], "trd_meds": 0},
+            "trader_2": {"id": second, "trd_water": 0, "trd_meds": POINTS["water"]},
+        }
+        for offer in trade.values():
+            offer.update(trd_food=0, trd_ammo=0)
+        self.client.post(reverse("survivor-trade"), trade, format="json")
+        for reporter in SurvivorFactory.create_batch(3, infected=False):
+            self.client.post(
+                reverse("report-list"),
+                {"gotReported": second, "whoReported": reporter.id},
+                format="json",
+            )
+
+        data = self.changes()
+        self.assertFalse(data["more"])
+        changes = data["changes"]
+        self.assertEqual(data["next"], changes[-1]["id"])
+        self.assertEqual(
+            [(change["survivor"], change["kind"]) for change in changes],
+            [
+                (first, CREATED),
+                (second, CREATED),
+                (first, MOVED),
+                (first, TRADED),
+                (second, TRADED),
+                (second, INFECTED),
+            ],
+        )
+        self.assertEqual(changes[0]["inventory"]["water"], 10)
+        self.assertEqual(changes[2]["latitude"], -10)
+        self.assertEqual(
+            changes[3],
+            {
+                "id": changes[3]["id"],
+                "survivor": first,
+                "kind": TRADED,
+                "water": -POINTS["meds"],
+                "meds": POINTS["water"],
+            },
+        )
+
+        data = self.changes(since=changes[2]["id"])
+        self.assertEqual(
+            [change["kind"] for change in data["changes"]], [TRADED, TRADED, INFECTED]
+        )
+        self.assertEqual(
+            self.changes(since=data["next"]),
+            {"changes": [], "next": data["next"], "more": False},
+        )
+
+    def test_deletion(self):
+        survivor = self.create("Gone")
+        self.client.delete(reverse("survivor-detail", kwargs={"pk": survivor}))
+        self.assertEqual(
+            [
+                (change["survivor"], change["kind"])
+                for change in self.changes()["changes"]
+            ],
+            [(survivor, CREATED), (survivor, DELETED)],
+        )
+
+    def test_rejected_writes_are_not_logged(self):
+        survivor = SurvivorFactory(infected=True)
+        self.client.patch(
+            reverse("survivor-detail", kwargs={"pk": survivor.pk}),
+            {"latitude": -10, "longitude": 20},
+            format="json",
+        )
+        self.assertFalse(Change.objects.exists())
+
+    def test_invalid_params(self):
+        resp = self.client.get(self.list_url, {"since": -1})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.get(self.list_url, {"limit": 0})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
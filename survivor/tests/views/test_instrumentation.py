@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient, APITestCase
+
+from survivor.instrumentation import InstrumentationMiddleware
+from survivor.tests.factories.inventory import InventoryFactory
+
+
+def timings(resp):
+    return {
+        name: float(duration)
+        for name, duration in (
+            metric.split(";dur=") for metric in resp["Server-Timing"].split(", ")
+        )
+    }
+
+
+@override_settings(INSTRUMENTATION_HEADERS=True)
+class InstrumentationHeadersTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_headers(self):
+        InventoryFactory.create_batch(3, owner_survivor__infected=False)
+        with self.assertNumQueries(1):
+            resp = self.client.get(reverse("survivor-list"))
+        self.assertEqual(resp["X-Query-Count"], "1")
+        self.assertEqual(resp["X-Duplicate-Query-Count"], "0")
+        spent = timings(resp)
+        self.assertEqual(set(spent), {"wall", "db", "serializer"})
+        self.assertGreater(spent["db"], 0)
+        self.assertGreater(spent["serializer"], 0)
+        self.assertGreaterEqual(spent["wall"], spent["db"] + spent["serializer"])
+
+    def test_duplicate_queries(self):
+        def view(request):
+            for survivor_id in (1, 2, 3):
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT %s", [survivor_id])
+            return HttpResponse()
+
+        resp = InstrumentationMiddleware(view)(RequestFactory().get("/"))
+        self.assertEqual(resp["X-Query-Count"], "3")
+        self.assertEqual(resp["X-Duplicate-Query-Count"], "2")
+
+
+@override_settings(INSTRUMENTATION_HEADERS=False)
+class InstrumentationLogTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_logged(self):
+        with self.assertLogs("survivor.requests") as logs:
+            resp = self.client.get(reverse("survivor-record"))
+        self.assertNotIn("Server-Timing", resp)
+        (record,) = logs.records
+        summary = record.instrumentation
+        self.assertEqual(summary["route"], "survivor-record")
+        self.assertEqual(summary["status"], 400)
+        self.assertEqual(summary["queries"], 1)
+        self.assertIn("route=survivor-record", record.getMessage())
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=1)
+    def test_streaming_logged_after_body(self):
+        InventoryFactory.create_batch(3, owner_survivor__infected=False)
+        with self.assertNoLogs("survivor.requests"):
+            resp = self.client.get(reverse("survivor-export"))
+        with self.assertLogs("survivor.requests") as logs:
+            body = b"".join(resp.streaming_content)
+        self.assertEqual(len(body.splitlines()), 3)
+        (record,) = logs.records
+        self.assertEqual(record.instrumentation["route"], "survivor-export")
+        self.assertGreater(record.instrumentation["queries"], 0)
+
+    @override_settings(INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_not_sampled(self):
+        with self.assertNoLogs("survivor.requests"):
+            self.client.get(reverse("survivor-record"))
+
+
+@override_settings(INSTRUMENTATION_HEADERS=True)
+class AsyncInstrumentationTest(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        executor = ThreadPoolExecutor(max_workers=1)
+        patcher = mock.patch("survivor.async_views.EXECUTOR", executor)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(executor.shutdown)
+        self.addCleanup(lambda: executor.submit(connections.close_all).result())
+
+    async def test_queries_in_executor_threads(self):
+        resp = await self.async_client.get(reverse("async-survivor-list"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp["X-Query-Count"], "1")
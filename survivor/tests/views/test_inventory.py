@@ -1,12 +1,15 @@
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from survivor.models import Inventory
 from survivor.tests.factories.inventory import InventoryFactory
 
 
 class InventoryViewSetTest(APITestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
 
     def test_get_inventory_list(self):
@@ -15,7 +18,7 @@ class InventoryViewSetTest(APITestCase):
         resp = self.client.get(list_url)
         self.assertTrue(status.is_success(resp.status_code))
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        data = resp.json()
+        data = resp.json()["results"]
         self.assertEqual(len(inventory), len(data))
         for index in range(len(inventory)):
             self.assertEqual(inventory[index].id, data[index]["id"])
@@ -27,6 +30,18 @@ class InventoryViewSetTest(APITestCase):
                 inventory[index].owner_survivor.id, data[index]["owner_survivor"]
             )
 
+    def test_get_inventory_list_fields(self):
+        inventory = InventoryFactory.create_batch(3, owner_survivor__infected=False)
+        list_url = reverse("inventory-list")
+        resp = self.client.get(list_url, {"fields": "id,water", "page_size": 2})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual(
+            data["results"],
+            [{"id": item.id, "water": item.water} for item in inventory[:2]],
+        )
+        self.assertIsNotNone(data["next"])
+
     def test_get_inventory(self):
         inventory = InventoryFactory(owner_survivor__infected=False)
         detail_url = reverse("inventory-detail", kwargs={"pk": inventory.pk})
@@ -41,6 +56,38 @@ class InventoryViewSetTest(APITestCase):
         self.assertEqual(inventory.ammo, data["ammo"])
         self.assertEqual(inventory.owner_survivor.id, data["owner_survivor"])
 
+    def test_get_inventory_list_queries(self):
+        InventoryFactory.create_batch(10, owner_survivor__infected=False)
+        with self.assertNumQueries(1):
+            resp = self.client.get(reverse("inventory-list"))
+        self.assertEqual(len(resp.json()["results"]), 10)
+
+    def test_get_inventory_queries(self):
+        inventory = InventoryFactory(owner_survivor__infected=False)
+        detail_url = reverse("inventory-detail", kwargs={"pk": inventory.pk})
+        with self.assertNumQueries(1):
+            resp = self.client.get(detail_url)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_get_inventory_etag(self):
+        inventory = InventoryFactory(owner_survivor__infected=False)
+        detail_url = reverse("inventory-detail", kwargs={"pk": inventory.pk})
+        etag = self.client.get(detail_url)["ETag"]
+        cache.clear()
+        with self.assertNumQueries(1):
+            resp = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        Inventory.objects.filter(pk=inventory.pk).update(water=inventory.water + 1)
+        cache.clear()
+        resp = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.json()["water"], inventory.water + 1)
+
+        list_url = reverse("inventory-list")
+        etag = self.client.get(list_url)["ETag"]
+        resp = self.client.get(list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
     def test_get_infected_inventory(self):
         inventory = InventoryFactory(owner_survivor__infected=True)
         detail_url = reverse("inventory-detail", kwargs={"pk": inventory.pk})
@@ -0,0 +1,100 @@
+from django.core.cache import cache
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient, APITestCase
+
+from survivor.points import POINTS
+from survivor.tests.factories.inventory import InventoryFactory
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+class MetricsTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.inventories = InventoryFactory.create_batch(
+            3, owner_survivor__infected=False, water=20, food=20, meds=20, ammo=20
+        )
+
+    def trade(self, survivor_1, survivor_2, extra_water=0):
+        # Water for meds, worth the same points.
+        water = POINTS["meds"] + extra_water
+        trade = {
+            "trader_1": {"id": survivor_1.pk, "trd_water": water, "trd_meds": 0},
+            "trader_2": {
+                "id": survivor_2.pk,
+                "trd_water": 0,
+                "trd_meds": POINTS["water"],
+            },
+        }
+        for offer in trade.values():
+            offer.update(trd_food=0, trd_ammo=0)
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(reverse("survivor-trade"), trade, format="json")
+
+    def test_trades(self):
+        trades = sample("zssn_trades_total")
+        water = sample("zssn_resources_moved_total", resource="water")
+        meds = sample("zssn_resources_moved_total", resource="meds")
+        survivor_1, survivor_2, _ = [i.owner_survivor for i in self.inventories]
+        self.assertEqual(self.trade(survivor_1, survivor_2).status_code, 200)
+        self.assertEqual(sample("zssn_trades_total"), trades + 1)
+        self.assertEqual(
+            sample("zssn_resources_moved_total", resource="water"),
+            water + POINTS["meds"],
+        )
+        self.assertEqual(
+            sample("zssn_resources_moved_total", resource="meds"),
+            meds + POINTS["water"],
+        )
+
+    def test_rejected_trades(self):
+        trades = sample("zssn_trades_total")
+        rejected = {
+            reason: sample("zssn_trades_rejected_total", reason=reason)
+            for reason in ("same_survivor", "unequal_points", "infected")
+        }
+        survivor_1, survivor_2, survivor_3 = [
+            i.owner_survivor for i in self.inventories
+        ]
+        survivor_3.infected = True
+        survivor_3.save()
+        self.trade(survivor_1, survivor_1)
+        self.trade(survivor_1, survivor_2, extra_water=1)
+        self.trade(survivor_1, survivor_3)
+        self.assertEqual(sample("zssn_trades_total"), trades)
+        for reason, count in rejected.items():
+            self.assertEqual(
+                sample("zssn_trades_rejected_total", reason=reason), count + 1
+            )
+
+    def test_reports_and_infections(self):
+        reports = sample("zssn_reports_total")
+        infections = sample("zssn_infections_total")
+        reported = InventoryFactory(owner_survivor__infected=False).owner_survivor
+        for inventory in self.inventories:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(
+                    reverse("report-list"),
+                    {
+                        "gotReported": reported.pk,
+                        "whoReported": inventory.owner_survivor.pk,
+                    },
+                    format="json",
+                )
+        self.assertEqual(sample("zssn_reports_total"), reports + 3)
+        self.assertEqual(sample("zssn_infections_total"), infections + 1)
+
+    def test_endpoint(self):
+        self.client.get(reverse("survivor-list"))
+        resp = self.client.get(reverse("metrics"))
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp["Content-Type"].startswith("text/plain; version=0.0.4"))
+        body = resp.content.decode()
+        self.assertIn("# TYPE zssn_request_duration_seconds histogram", body)
+        self.assertIn('route="survivor-list"', body)
+        self.assertIn("zssn_trades_total", body)
+        self.assertIn("zssn_trades_rejected_total", body)
@@ -0,0 +1,132 @@
+import datetime
+import decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APITestCase
+
+from survivor.choices import FEMALE
+from survivor.renderers import FastJSONParser, FastJSONRenderer
+from survivor.tests.factories.inventory import InventoryFactory
+from survivor.tests.factories.report import ReportFactory
+
+
+class FastJSONRendererTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def assertSameJSON(self, data):
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_endpoints_match_json_renderer(self):
+        inventories = InventoryFactory.create_batch(
+            3,
+            owner_survivor__infected=False,
+            owner_survivor__name="Zoë  ☣",
+            owner_survivor__latitude=-12.25,
+            owner_survivor__longitude=0.1 + 0.2,
+            water=8,
+            food=6,
+            meds=4,
+            ammo=2,
+        )
+        survivor = inventories[0].owner_survivor
+        report = ReportFactory()
+        survivor_payload = {
+            "name": "Teste",
+            "age": 25,
+            "gender": FEMALE,
+            "latitude": 50,
+            "longitude": 50,
+            "inventory": {"water": 4, "food": 3, "meds": 2, "ammo": 1},
+        }
+        requests = [
+            ("get", reverse("survivor-list"), None),
+            ("get", reverse("survivor-list"), {"fields": "id,name"}),
+            ("get", reverse("survivor-detail", kwargs={"pk": survivor.pk}), None),
+            ("get", reverse("survivor-record"), None),
+            ("get", reverse("survivor-cache"), None),
+            ("get", reverse("survivor-nearby"), {"lat": -12, "lon": 0, "radius": 50}),
+            ("get", reverse("survivor-nearby"), {"lat": 100}),
+            ("get", reverse("inventory-list"), None),
+            (
+                "get",
+                reverse("inventory-detail", kwargs={"pk": inventories[1].pk}),
+                None,
+            ),
+            ("get", reverse("report-list"), None),
+            ("get", reverse("report-detail", kwargs={"pk": report.pk}), None),
+            ("post", reverse("survivor-list"), survivor_payload),
+            ("post", reverse("survivor-bulk"), [survivor_payload, {"age": -1}]),
+            (
+                "post",
+                reverse("survivor-locations"),
+                [{"id": survivor.pk, "latitude": 1.5, "longitude": 2}],
+            ),
+            (
+                "post",
+                reverse("survivor-trade"),
+                {
+                    "trader_1": {
+                        "id": survivor.pk,
+                        "trd_water": 1,
+                        "trd_food": 0,
+                        "trd_meds": 0,
+                        "trd_ammo": 0,
+                    },
+                    "trader_2": {
+                        "id": inventories[1].owner_survivor.pk,
+                        "trd_water": 0,
+                        "trd_food": 0,
+                        "trd_meds": 2,
+                        "trd_ammo": 0,
+                    },
+                },
+            ),
+            (
+                "post",
+                reverse("report-bulk"),
+                [{"gotReported": survivor.pk, "whoReported": survivor.pk}],
+            ),
+            ("patch", reverse("survivor-detail", kwargs={"pk": survivor.pk}), {}),
+        ]
+        for method, url, data in requests:
+            with self.subTest(method=method, url=url):
+                if method == "get":
+                    resp = self.client.get(url, data)
+                else:
+                    resp = getattr(self.client, method)(url, data, format="json")
+                self.assertIsInstance(resp.accepted_renderer, FastJSONRenderer)
+                self.assertEqual(resp.content, JSONRenderer().render(resp.data))
+
+    def test_values_match_json_renderer(self):
+        self.assertSameJSON(
+            {
+                "decimal": decimal.Decimal("12.340"),
+                "datetime": datetime.datetime(
+                    2026, 10, 18, 7, 40, 1, 123456, tzinfo=datetime.timezone.utc
+                ),
+                "date": datetime.date(2026, 10, 18),
+                "line_separators": "  ",
+                1: [None, True, 3, -45.5],
+            }
+        )
+        self.assertSameJSON({"big": 2**70})
+
+    def test_stdlib_fallback(self):
+        data = {"name": "Zoë", "value": decimal.Decimal("1.5")}
+        with mock.patch("survivor.renderers.orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(data), JSONRenderer().render(data)
+            )
+
+    def test_parser(self):
+        resp = self.client.post(
+            reverse("survivor-list"), "{", content_type="application/json"
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("JSON parse error", resp.json()["detail"])
+        self.assertIsInstance(FastJSONParser.renderer_class(), FastJSONRenderer)
@@ -1,7 +1,11 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+from survivor import reporting
 from survivor.models import Report
 from survivor.serializers import ReportSerializer
 from survivor.tests.factories.report import ReportFactory
@@ -10,6 +14,7 @@ from survivor.tests.factories.survivor import SurvivorFactory
 
 class ReportViewSetTest(APITestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
 
     def test_get_report_list(self):
@@ -84,3 +89,85 @@ class ReportViewSetTest(APITestCase):
         resp = self.client.post(post_url, data, format="json")
         self.assertTrue(status.is_client_error(resp.status_code))
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_delete_report(self):
+        survivor = SurvivorFactory(infected=False)
+        reporter = SurvivorFactory(infected=False)
+        data = {"gotReported": survivor.id, "whoReported": reporter.id}
+        resp = self.client.post(reverse("report-list"), data, format="json")
+        detail_url = reverse("report-detail", kwargs={"pk": resp.json()["id"]})
+        resp = self.client.delete(detail_url)
+        self.assertEqual(resp.status_code, status.HTTP_204_NO_CONTENT)
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.report_count, 0)
+
+    def test_delete_reporter(self):
+        survivor = SurvivorFactory(infected=False)
+        reporter = SurvivorFactory(infected=False)
+        data = {"gotReported": survivor.id, "whoReported": reporter.id}
+        self.client.post(reverse("report-list"), data, format="json")
+        self.client.delete(reverse("survivor-detail", kwargs={"pk": reporter.pk}))
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.report_count, 0)
+
+    def test_post_report_bulk(self):
+        survivors = SurvivorFactory.create_batch(5, infected=False)
+        infected = SurvivorFactory(infected=True)
+        ReportFactory(gotReported=survivors[0], whoReported=survivors[4])
+        ids = [survivor.id for survivor in survivors]
+        payload = [
+            {"gotReported": ids[0], "whoReported": ids[1]},
+            {"gotReported": ids[0], "whoReported": ids[2]},
+            {"gotReported": ids[0], "whoReported": ids[3]},
+            {"gotReported": ids[0], "whoReported": ids[3]},
+            {"gotReported": ids[0], "whoReported": ids[4]},
+            {"gotReported": ids[1], "whoReported": infected.id},
+            {"gotReported": ids[1], "whoReported": ids[1]},
+            {"gotReported": ids[1], "whoReported": 0},
+            {"gotReported": ids[1], "whoReported": ids[0]},
+        ]
+        with self.assertNumQueries(9):
+            resp = self.client.post(reverse("report-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        data = resp.json()
+        self.assertEqual(data["accepted"], 4)
+        self.assertEqual(data["infected"], [ids[0]])
+        self.assertEqual([error["index"] for error in data["errors"]], [3, 4, 5, 6, 7])
+        survivors[0].refresh_from_db()
+        self.assertEqual(survivors[0].report_count, 4)
+        self.assertTrue(survivors[0].infected)
+        survivors[1].refresh_from_db()
+        self.assertEqual(survivors[1].report_count, 1)
+        self.assertFalse(survivors[1].infected)
+
+    def test_post_report_bulk_filed_concurrently(self):
+        reported, reporter, other = SurvivorFactory.create_batch(3, infected=False)
+        insert_reports = reporting._insert_reports
+
+        def filed_meanwhile(pairs):
+            # Another request files the same pair after it was checked.
+            Report.objects.create(gotReported=reported, whoReported=reporter)
+            return insert_reports(pairs)
+
+        payload = [
+            {"gotReported": reported.id, "whoReported": other.id},
+            {"gotReported": reported.id, "whoReported": reporter.id},
+        ]
+        with mock.patch("survivor.reporting._insert_reports", filed_meanwhile):
+            resp = self.client.post(reverse("report-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        data = resp.json()
+        self.assertEqual(data["accepted"], 1)
+        self.assertEqual(
+            data["errors"],
+            [{"index": 1, "errors": {"error": reporting.ALREADY_REPORTED}}],
+        )
+        reported.refresh_from_db()
+        self.assertEqual(reported.report_count, 2)
+
+    def test_post_report_bulk_rejected(self):
+        survivor = SurvivorFactory()
+        payload = [{"gotReported": survivor.id, "whoReported": survivor.id}]
+        resp = self.client.post(reverse("report-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Report.objects.count(), 0)
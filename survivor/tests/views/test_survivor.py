@@ -1,15 +1,24 @@
+import csv
+import io
+import json
+
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
 from survivor.choices import FEMALE
-from survivor.models import Survivor
+from survivor.geo import grid_cell
+from survivor.models import Inventory, Survivor
+from survivor.records import count_record, load_record
+from survivor.serializers import SurvivorSerializer
 from survivor.tests.factories.inventory import InventoryFactory
 from survivor.tests.factories.survivor import SurvivorFactory
 
 
 class SurvivorViewSetTest(APITestCase):
     def setUp(self):
+        cache.clear()
         self.client = APIClient()
         self.list_url = reverse("survivor-list")
         self.data = {
@@ -26,7 +35,7 @@ class SurvivorViewSetTest(APITestCase):
         resp = self.client.get(self.list_url)
         self.assertTrue(status.is_success(resp.status_code))
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
-        data = resp.json()
+        data = resp.json()["results"]
         self.assertEqual(len(survivors), len(data))
         for index in range(len(survivors)):
             self.assertEqual(survivors[index].name, data[index]["name"])
@@ -37,6 +46,40 @@ class SurvivorViewSetTest(APITestCase):
             self.assertEqual(survivors[index].infected, data[index]["infected"])
             self.assertEqual(data[index]["inventory"], None)
 
+    def test_get_survivor_list_pages(self):
+        survivors = SurvivorFactory.create_batch(5, infected=False)
+        resp = self.client.get(self.list_url, {"page_size": 2})
+        ids = []
+        while True:
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            page = resp.json()
+            self.assertLessEqual(len(page["results"]), 2)
+            ids += [survivor["id"] for survivor in page["results"]]
+            if page["next"] is None:
+                break
+            resp = self.client.get(page["next"])
+        self.assertEqual(ids, [survivor.id for survivor in survivors])
+
+    def test_get_survivor_list_fields(self):
+        InventoryFactory.create_batch(3, owner_survivor__infected=False)
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.list_url, {"fields": "id,latitude,longitude"})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        for survivor in resp.json()["results"]:
+            self.assertEqual(set(survivor), {"id", "latitude", "longitude"})
+
+    def test_get_survivor_list_fields_inventory(self):
+        inventory = InventoryFactory(owner_survivor__infected=False)
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.list_url, {"fields": "id,inventory"})
+        data = resp.json()["results"]
+        self.assertEqual(data[0]["id"], inventory.owner_survivor.id)
+        self.assertEqual(data[0]["inventory"]["water"], inventory.water)
+
+    def test_get_survivor_list_unknown_field(self):
+        resp = self.client.get(self.list_url, {"fields": "id,password"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_get_survivor(self):
         survivor = SurvivorFactory(infected=False)
         detail_url = reverse("survivor-detail", kwargs={"pk": survivor.pk})
@@ -52,6 +95,288 @@ class SurvivorViewSetTest(APITestCase):
         self.assertEqual(survivor.infected, data["infected"])
         self.assertEqual(data["inventory"], None)
 
+    def test_get_survivor_list_queries(self):
+        InventoryFactory.create_batch(10, owner_survivor__infected=False)
+        SurvivorFactory.create_batch(5, infected=False)
+        with self.assertNumQueries(1):
+            resp = self.client.get(self.list_url)
+        self.assertEqual(len(resp.json()["results"]), 15)
+
+    def test_get_survivor_queries(self):
+        inventory = InventoryFactory(owner_survivor__infected=False)
+        detail_url = reverse(
+            "survivor-detail", kwargs={"pk": inventory.owner_survivor.pk}
+        )
+        with self.assertNumQueries(1):
+            resp = self.client.get(detail_url)
+        self.assertEqual(resp.json()["inventory"]["water"], inventory.water)
+
+    def test_get_survivor_etag(self):
+        inventory = InventoryFactory(owner_survivor__infected=False, water=5, meds=0)
+        survivor = inventory.owner_survivor
+        detail_url = reverse("survivor-detail", kwargs={"pk": survivor.pk})
+        etag = self.client.get(detail_url)["ETag"]
+        with self.assertNumQueries(0):
+            resp = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        cache.clear()
+        with self.assertNumQueries(1):
+            resp = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(resp["ETag"], etag)
+
+        other = InventoryFactory(owner_survivor__infected=False, water=0, meds=4)
+        trade = {
+            "trader_1": {"id": survivor.pk, "trd_water": 1, "trd_meds": 0},
+            "trader_2": {"id": other.owner_survivor.pk, "trd_water": 0, "trd_meds": 2},
+        }
+        for offer in trade.values():
+            offer.update(trd_food=0, trd_ammo=0)
+        self.client.post(reverse("survivor-trade"), trade, format="json")
+        resp = self.client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(resp["ETag"], etag)
+
+        Survivor.objects.filter(pk=survivor.pk).update(infected=True)
+        cache.clear()
+        resp = self.client.get(detail_url, HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_survivor_version(self):
+        survivor = SurvivorFactory(latitude=0, longitude=0, infected=False)
+        Survivor.objects.filter(pk=survivor.pk).update(report_count=2)
+        survivor.save()
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.version, 1)
+        self.client.post(
+            reverse("survivor-locations"),
+            [{"id": survivor.pk, "latitude": 1, "longitude": 1}],
+            format="json",
+        )
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.version, 2)
+        survivor.version = 1
+        survivor.infected = True
+        survivor.save()
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.version, 3)
+
+    def test_get_survivor_etag_per_format(self):
+        survivor = InventoryFactory(owner_survivor__infected=False).owner_survivor
+        detail_url = reverse("survivor-detail", kwargs={"pk": survivor.pk})
+        etag = self.client.get(detail_url)["ETag"]
+        api_url = f"{detail_url}?format=api"
+        api_etag = self.client.get(api_url)["ETag"]
+        self.assertNotEqual(api_etag, etag)
+        resp = self.client.get(api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        cache.clear()
+        resp = self.client.get(api_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        resp = self.client.get(api_url, HTTP_IF_NONE_MATCH=api_etag)
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_survivor_list_etag(self):
+        survivors = SurvivorFactory.create_batch(3, infected=False)
+        resp = self.client.get(self.list_url, {"page_size": 2})
+        etag = resp["ETag"]
+        with self.assertNumQueries(1):
+            resp = self.client.get(
+                self.list_url, {"page_size": 2}, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+        resp = self.client.get(
+            self.list_url, {"page_size": 2, "fields": "id"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.client.post(
+            reverse("survivor-locations"),
+            [{"id": survivors[1].pk, "latitude": 1, "longitude": 1}],
+            format="json",
+        )
+        resp = self.client.get(self.list_url, {"page_size": 2}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_get_survivor_cached(self):
+        inventory = InventoryFactory(owner_survivor__infected=False, water=5, food=0)
+        survivor = inventory.owner_survivor
+        detail_url = reverse("survivor-detail", kwargs={"pk": survivor.pk})
+        self.client.get(detail_url)
+        with self.assertNumQueries(0):
+            resp = self.client.get(detail_url)
+        self.assertEqual(resp.json()["inventory"]["water"], 5)
+
+        self.client.patch(detail_url, {"latitude": 10, "longitude": 10}, format="json")
+        self.assertEqual(self.client.get(detail_url).json()["latitude"], 10)
+
+        other = InventoryFactory(owner_survivor__infected=False, water=0, meds=4)
+        trade = {
+            "trader_1": {"id": survivor.pk, "trd_water": 1, "trd_meds": 0},
+            "trader_2": {"id": other.owner_survivor.pk, "trd_water": 0, "trd_meds": 2},
+        }
+        for offer in trade.values():
+            offer.update(trd_food=0, trd_ammo=0)
+        self.client.post(reverse("survivor-trade"), trade, format="json")
+        self.assertEqual(self.client.get(detail_url).json()["inventory"]["water"], 4)
+
+        for reporter in SurvivorFactory.create_batch(3, infected=False):
+            self.client.post(
+                reverse("report-list"),
+                {"gotReported": survivor.pk, "whoReported": reporter.pk},
+                format="json",
+            )
+        resp = self.client.get(detail_url)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        inventory_url = reverse("inventory-detail", kwargs={"pk": inventory.pk})
+        resp = self.client.get(inventory_url)
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.delete(detail_url)
+        resp = self.client.get(detail_url)
+        self.assertEqual(resp.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_record_cached(self):
+        self.client.post(self.list_url, self.data, format="json")
+        record_url = reverse("survivor-record")
+        self.client.get(record_url)
+        with self.assertNumQueries(0):
+            self.client.get(record_url)
+        hits = self.client.get(reverse("survivor-cache")).json()["hits"]
+        self.client.post(self.list_url, dict(self.data, inventory=None), format="json")
+        self.client.post(
+            self.list_url,
+            dict(self.data, inventory={"water": 0, "food": 4, "meds": 3, "ammo": 2}),
+            format="json",
+        )
+        resp = self.client.get(record_url)
+        self.assertEqual(float(resp.json()["avg_water"]), 20)
+        stats = self.client.get(reverse("survivor-cache")).json()
+        self.assertEqual(stats["hits"], hits)
+        self.assertGreater(stats["misses"], 0)
+
+    def test_nearby(self):
+        near = SurvivorFactory(latitude=0, longitude=0.1, infected=False)
+        far = SurvivorFactory(latitude=0, longitude=1, infected=False)
+        SurvivorFactory(latitude=0, longitude=0.05, infected=True)
+        SurvivorFactory(latitude=0, longitude=3, infected=False)
+        nearby_url = reverse("survivor-nearby")
+        with self.assertNumQueries(1):
+            resp = self.client.get(nearby_url, {"lat": 0, "lon": 0, "radius": 150})
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual([survivor["id"] for survivor in data], [near.id, far.id])
+        self.assertAlmostEqual(data[0]["distance"], 11.12, places=1)
+        resp = self.client.get(
+            nearby_url, {"lat": 0, "lon": 0, "radius": 150, "limit": 1}
+        )
+        self.assertEqual(len(resp.json()), 1)
+
+    def test_nearby_antimeridian(self):
+        survivor = SurvivorFactory(latitude=10, longitude=-179.95, infected=False)
+        resp = self.client.get(
+            reverse("survivor-nearby"), {"lat": 10, "lon": 179.9, "radius": 20}
+        )
+        self.assertEqual([s["id"] for s in resp.json()], [survivor.id])
+
+    def test_nearby_invalid(self):
+        resp = self.client.get(
+            reverse("survivor-nearby"), {"lat": 95, "lon": 0, "radius": 10}
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_patch_survivor_grid_cell(self):
+        survivor = SurvivorFactory(latitude=0, longitude=0, infected=False)
+        patch_url = reverse("survivor-detail", kwargs={"pk": survivor.pk})
+        self.client.patch(patch_url, {"latitude": 45, "longitude": 45}, format="json")
+        survivor.refresh_from_db()
+        self.assertEqual(survivor.grid_cell, grid_cell(45, 45))
+
+    def test_post_locations(self):
+        moving = SurvivorFactory(latitude=0, longitude=0, infected=False)
+        infected = SurvivorFactory(latitude=0, longitude=0, infected=True)
+        payload = [
+            {"id": moving.pk, "latitude": 10, "longitude": 20},
+            {"id": infected.pk, "latitude": 10, "longitude": 20},
+            {"id": moving.pk, "latitude": -45.5, "longitude": 179.5},
+            {"id": moving.pk, "latitude": 91, "longitude": 0},
+            {"id": "x", "longitude": 0},
+        ]
+        with self.assertNumQueries(4):
+            resp = self.client.post(
+                reverse("survivor-locations"), payload, format="json"
+            )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual(data["updated"], 1)
+        self.assertEqual(data["skipped"], [infected.pk])
+        self.assertEqual([error["index"] for error in data["errors"]], [3, 4])
+        self.assertIn("latitude", data["errors"][0]["errors"])
+        self.assertEqual(set(data["errors"][1]["errors"]), {"id", "latitude"})
+        moving.refresh_from_db()
+        self.assertEqual((moving.latitude, moving.longitude), (-45.5, 179.5))
+        self.assertEqual(moving.grid_cell, grid_cell(-45.5, 179.5))
+        infected.refresh_from_db()
+        self.assertEqual((infected.latitude, infected.longitude), (0, 0))
+
+    def test_post_locations_invalid(self):
+        url = reverse("survivor-locations")
+        resp = self.client.post(url, {"id": 1}, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.post(
+            url, [{"id": 1, "latitude": 0, "longitude": 0}], format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(resp.json()["skipped"], [1])
+
+    def test_post_locations_id_out_of_range(self):
+        moving = SurvivorFactory(latitude=0, longitude=0, infected=False)
+        payload = [
+            {"id": 2**31, "latitude": 1, "longitude": 1},
+            {"id": 2**63, "latitude": 1, "longitude": 1},
+            {"id": moving.pk, "latitude": 1, "longitude": 1},
+        ]
+        resp = self.client.post(reverse("survivor-locations"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        data = resp.json()
+        self.assertEqual(data["updated"], 1)
+        self.assertEqual(data["skipped"], [2**31])
+        self.assertEqual([error["index"] for error in data["errors"]], [1])
+        self.assertIn("id", data["errors"][0]["errors"])
+
+    def test_export_ndjson(self):
+        inventory = InventoryFactory(owner_survivor__infected=False)
+        survivor = SurvivorFactory(infected=True)
+        resp = self.client.get(reverse("survivor-export"))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp["Content-Type"], "application/x-ndjson")
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(rows[0], SurvivorSerializer(inventory.owner_survivor).data)
+        self.assertEqual(rows[1], SurvivorSerializer(survivor).data)
+
+    def test_export_csv_filtered(self):
+        inventories = InventoryFactory.create_batch(4, owner_survivor__infected=False)
+        InventoryFactory(owner_survivor__infected=True)
+        owners = [inventory.owner_survivor for inventory in inventories]
+        resp = self.client.get(
+            reverse("survivor-export"),
+            {
+                "output": "csv",
+                "infected": "false",
+                "min_id": owners[1].id,
+                "max_id": owners[2].id,
+            },
+        )
+        self.assertEqual(resp["Content-Type"], "text/csv")
+        content = b"".join(resp.streaming_content).decode()
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual([int(row["id"]) for row in rows], [owners[1].id, owners[2].id])
+        self.assertEqual(int(rows[0]["water"]), inventories[1].water)
+
+    def test_export_invalid_format(self):
+        resp = self.client.get(reverse("survivor-export"), {"output": "xml"})
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_get_infected_survivor(self):
         survivor = SurvivorFactory(infected=True)
         detail_url = reverse("survivor-detail", kwargs={"pk": survivor.pk})
@@ -77,6 +402,31 @@ class SurvivorViewSetTest(APITestCase):
         self.assertEqual(self.data["inventory"]["ammo"], data["inventory"]["ammo"])
         self.assertEqual(Survivor.objects.count(), 1)
 
+    def test_post_survivor_bulk(self):
+        invalid = dict(self.data, age=-1)
+        payload = [self.data, invalid, dict(self.data, name="Second")]
+        with self.assertNumQueries(5):
+            resp = self.client.post(reverse("survivor-bulk"), payload, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        data = resp.json()
+        self.assertEqual(len(data["created"]), 2)
+        self.assertEqual(data["errors"][0]["index"], 1)
+        self.assertIn("age", data["errors"][0]["errors"])
+        survivors = Survivor.objects.filter(id__in=data["created"]).order_by("id")
+        self.assertEqual([s.name for s in survivors], ["Teste", "Second"])
+        self.assertEqual(survivors[1].inventory.water, self.data["inventory"]["water"])
+        self.assertEqual(load_record()["healthy_count"], 2)
+
+    def test_post_survivor_bulk_invalid(self):
+        resp = self.client.post(
+            reverse("survivor-bulk"), [{"name": "Teste"}], format="json"
+        )
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("inventory", resp.json()["errors"][0]["errors"])
+        resp = self.client.post(reverse("survivor-bulk"), self.data, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Survivor.objects.count(), 0)
+
     def test_patch_survivor(self):
         survivor = SurvivorFactory(longitude=30, latitude=30, infected=False)
         patch = {"longitude": 45, "latitude": 50}
@@ -88,6 +438,17 @@ class SurvivorViewSetTest(APITestCase):
         self.assertNotEqual(survivor.latitude, data["latitude"])
         self.assertNotEqual(survivor.longitude, data["longitude"])
 
+    def test_patch_survivor_queries(self):
+        inventory = InventoryFactory(owner_survivor__infected=False)
+        patch_url = reverse(
+            "survivor-detail", kwargs={"pk": inventory.owner_survivor.pk}
+        )
+        with self.assertNumQueries(5):
+            resp = self.client.patch(
+                patch_url, {"longitude": 45, "latitude": 50}, format="json"
+            )
+        self.assertEqual(resp.json()["inventory"]["water"], inventory.water)
+
     def test_patch_infected_survivor(self):
         survivor = SurvivorFactory(longitude=30, latitude=30, infected=True)
         patch = {"longitude": 45, "latitude": 50}
@@ -309,6 +670,47 @@ class SurvivorViewSetTest(APITestCase):
         self.assertTrue(status.is_client_error(resp.status_code))
         self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
 
+    def test_trade_batch(self):
+        inventories = InventoryFactory.create_batch(
+            3, owner_survivor__infected=False, water=2, food=0, meds=4, ammo=0
+        )
+        infected = InventoryFactory(owner_survivor__infected=True, water=2)
+        ids = [inventory.owner_survivor.id for inventory in inventories]
+
+        def exchange(id_1, id_2, water_1=0, meds_2=0):
+            empty = {"trd_water": 0, "trd_food": 0, "trd_meds": 0, "trd_ammo": 0}
+            return {
+                "trader_1": dict(empty, id=id_1, trd_water=water_1),
+                "trader_2": dict(empty, id=id_2, trd_meds=meds_2),
+            }
+
+        trades = [
+            exchange(ids[0], ids[1], water_1=2, meds_2=4),
+            exchange(ids[0], ids[2], water_1=1, meds_2=2),
+            exchange(ids[1], ids[0], water_1=4, meds_2=8),
+            exchange(ids[1], ids[2], water_1=1, meds_2=1),
+            exchange(ids[2], infected.owner_survivor.id),
+            {"trader_1": {"id": ids[0]}},
+        ]
+        with self.assertNumQueries(5):
+            resp = self.client.post(
+                reverse("survivor-trade-batch"), trades, format="json"
+            )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        results = resp.json()["results"]
+        self.assertEqual([result["index"] for result in results], list(range(6)))
+        self.assertEqual(results[0]["inventories"][0]["water"], 0)
+        self.assertEqual(results[1]["error"], "Not enough resources to trade")
+        self.assertEqual(results[2]["inventories"][0]["water"], 0)
+        self.assertEqual(results[2]["inventories"][1]["meds"], 0)
+        self.assertIn("Both parties", results[3]["error"])
+        self.assertIn("infected", results[4]["error"])
+        self.assertIn("trader_2", results[5]["error"])
+        waters = [
+            Inventory.objects.get(pk=inventory.pk).water for inventory in inventories
+        ]
+        self.assertEqual(waters, [4, 0, 2])
+
     def test_report(self):
         inventories = InventoryFactory.create_batch(
             10, owner_survivor__infected=False, water=10, food=10, meds=10, ammo=10
@@ -350,3 +752,56 @@ class SurvivorViewSetTest(APITestCase):
         self.assertEqual(data["avg_meds"], str(avg_meds))
         self.assertEqual(data["avg_ammo"], str(avg_ammo))
         self.assertEqual(data["lostpt"], lostpt)
+
+    def test_report_constant_queries(self):
+        record_url = reverse("survivor-record")
+        for size in (5, 50):
+            InventoryFactory.create_batch(
+                size, owner_survivor__infected=False, water=8, food=6, meds=4, ammo=2
+            )
+            InventoryFactory.create_batch(
+                size, owner_survivor__infected=True, water=1, food=3, meds=5, ammo=7
+            )
+            cache.clear()
+            with self.assertNumQueries(1):
+                resp = self.client.get(record_url)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+    def test_report_no_survivors(self):
+        InventoryFactory(owner_survivor__infected=True)
+        resp = self.client.get(reverse("survivor-record"))
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_statistics_follow_api_writes(self):
+        survivors = []
+        for _ in range(4):
+            resp = self.client.post(self.list_url, self.data, format="json")
+            survivors.append(resp.json()["id"])
+        for reporter in survivors[1:]:
+            self.client.post(
+                reverse("report-list"),
+                {"gotReported": survivors[0], "whoReported": reporter},
+                format="json",
+            )
+        trade_data = {
+            "trader_1": {
+                "id": survivors[1],
+                "trd_water": 1,
+                "trd_food": 0,
+                "trd_meds": 0,
+                "trd_ammo": 0,
+            },
+            "trader_2": {
+                "id": survivors[2],
+                "trd_water": 0,
+                "trd_food": 0,
+                "trd_meds": 2,
+                "trd_ammo": 0,
+            },
+        }
+        resp = self.client.post(reverse("survivor-trade"), trade_data, format="json")
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.client.delete(reverse("survivor-detail", kwargs={"pk": survivors[3]}))
+        self.assertEqual(load_record(), count_record())
+        self.assertEqual(load_record()["infected_count"], 1)
+        self.assertEqual(load_record()["healthy_count"], 2)
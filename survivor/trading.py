@@ -0,0 +1,190 @@
+import copy
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+
+from survivor.caching import invalidate
+from survivor.changes import record_trades
+from survivor.metrics import count_rejected_trade, count_trade
+from survivor.models import Inventory
+from survivor.points import POINTS, RESOURCES
+
+SAME_SURVIVOR = "same_survivor"
+UNEQUAL_POINTS = "unequal_points"
+NOT_FOUND = "not_found"
+INFECTED = "infected"
+INSUFFICIENT = "insufficient"
+
+
+class TradeError(Exception):
+    messages = {
+        SAME_SURVIVOR: "Trade must be between different survivors",
+        UNEQUAL_POINTS: "Both parties must trade an equal ammount of points",
+        NOT_FOUND: "Trading survivor or inventory not found",
+        INFECTED: "One of the trading parties is infected",
+        INSUFFICIENT: "Not enough resources to trade",
+    }
+
+    def __init__(self, reason):
+        self.reason = reason
+        self.message = self.messages[reason]
+        super().__init__(self.message)
+
+
+def points(offer):
+    return sum(offer[f"trd_{resource}"] * POINTS[resource] for resource in RESOURCES)
+
+
+def check_offers(offer_1, offer_2):
+    if offer_1["id"] == offer_2["id"]:
+        raise TradeError(SAME_SURVIVOR)
+    if points(offer_1) != points(offer_2):
+        raise TradeError(UNEQUAL_POINTS)
+
+
+def trade_deltas(offer_1, offer_2):
+    """Map each trader id to the change of each resource in its inventory."""
+    return {
+        offer["id"]: {
+            resource: other[f"trd_{resource}"] - offer[f"trd_{resource}"]
+            for resource in RESOURCES
+        }
+        for offer, other in [(offer_1, offer_2), (offer_2, offer_1)]
+    }
+
+
+def locked_inventories(owner_ids):
+    # Rows are locked in inventory id order so that concurrent trades sharing
+    # a survivor always queue up instead of deadlocking.
+    return {
+        inventory.owner_survivor_id: inventory
+        for inventory in Inventory.objects.select_for_update()
+        .select_related("owner_survivor")
+        .filter(owner_survivor__in=owner_ids)
+        .order_by("id")
+    }
+
+
+def check_inventory(inventory, delta):
+    if inventory is None:
+        raise TradeError(NOT_FOUND)
+    if inventory.owner_survivor.infected:
+        raise TradeError(INFECTED)
+    if any(getattr(inventory, name) + delta[name] < 0 for name in RESOURCES):
+        raise TradeError(INSUFFICIENT)
+
+
+def apply_deltas(deltas_by_pk):
+    """Apply resource deltas to inventories in a single guarded UPDATE."""
+    guards = [
+        Q(
+            pk=pk,
+            **{f"{name}__gte": -delta[name] for name in RESOURCES if delta[name] < 0},
+        )
+        for pk, delta in deltas_by_pk.items()
+    ]
+    changes = {
+        name: Case(
+            *[
+                When(pk=pk, then=F(name) + delta[name])
+                for pk, delta in deltas_by_pk.items()
+            ],
+            default=F(name),
+        )
+        for name in RESOURCES
+    }
+    updated = Inventory.objects.filter(reduce(or_, guards)).update(**changes)
+    if updated != len(deltas_by_pk):
+        raise TradeError(INSUFFICIENT)
+
+
+def execute_trade(offer_1, offer_2):
+    """Swap the offered resources between two survivors.
+
+    Returns both inventories, in trader order, with their new totals.
+    """
+    try:
+        check_offers(offer_1, offer_2)
+        deltas = trade_deltas(offer_1, offer_2)
+        with transaction.atomic():
+            inventories = locked_inventories(deltas)
+            for owner_id, delta in deltas.items():
+                check_inventory(inventories.get(owner_id), delta)
+            apply_deltas(
+                {inventories[owner_id].pk: delta for owner_id, delta in deltas.items()}
+            )
+            invalidate(deltas, [inventories[owner_id].pk for owner_id in deltas])
+            record_trades([deltas])
+            count_trade(offer_1, offer_2)
+    except TradeError as exc:
+        count_rejected_trade(exc)
+        raise
+    for owner_id, delta in deltas.items():
+        for name in RESOURCES:
+            setattr(
+                inventories[owner_id],
+                name,
+                getattr(inventories[owner_id], name) + delta[name],
+            )
+    return [inventories[offer_1["id"]], inventories[offer_2["id"]]]
+
+
+def execute_trades(exchanges):
+    """Apply (offer_1, offer_2) trades in order inside one transaction.
+
+    Every inventory involved is locked by a single query and the trades are
+    replayed in memory against the locked rows, so a trade sees the effect
+    of the ones before it. The final totals are written back with a single
+    bulk UPDATE. Returns, per trade, either the TradeError that rejected it
+    or copies of both inventories, in trader order, right after it was
+    applied.
+    """
+    outcomes = [None] * len(exchanges)
+    owner_ids = set()
+    for index, (offer_1, offer_2) in enumerate(exchanges):
+        try:
+            check_offers(offer_1, offer_2)
+        except TradeError as exc:
+            count_rejected_trade(exc)
+            outcomes[index] = exc
+        else:
+            owner_ids.update([offer_1["id"], offer_2["id"]])
+    if not owner_ids:
+        return outcomes
+    with transaction.atomic():
+        inventories = locked_inventories(owner_ids)
+        traded, trades = set(), []
+        for index, (offer_1, offer_2) in enumerate(exchanges):
+            if outcomes[index] is not None:
+                continue
+            deltas = trade_deltas(offer_1, offer_2)
+            try:
+                for owner_id, delta in deltas.items():
+                    check_inventory(inventories.get(owner_id), delta)
+            except TradeError as exc:
+                count_rejected_trade(exc)
+                outcomes[index] = exc
+                continue
+            for owner_id, delta in deltas.items():
+                for name in RESOURCES:
+                    setattr(
+                        inventories[owner_id],
+                        name,
+                        getattr(inventories[owner_id], name) + delta[name],
+                    )
+            traded.update(deltas)
+            trades.append(deltas)
+            count_trade(offer_1, offer_2)
+            outcomes[index] = [
+                copy.copy(inventories[offer_1["id"]]),
+                copy.copy(inventories[offer_2["id"]]),
+            ]
+        if traded:
+            Inventory.objects.bulk_update(
+                [inventories[owner_id] for owner_id in traded], RESOURCES
+            )
+            invalidate(traded, [inventories[owner_id].pk for owner_id in traded])
+            record_trades(trades)
+    return outcomes
@@ -1,165 +1,224 @@
-from decouple import config
+from django.conf import settings
 from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
-from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
+from .caching import RECORD, fetch, invalidate, invalidate_owners, stats
+from .changes import changes_since, record_deletions, record_moves
+from .export import EXPORT_FORMATS, export_chunks, export_queryset
+from .locations import apply_fixes, validate_fixes
+from .mixins import SparseFieldsViewMixin, VersionedViewMixin
 from .models import Inventory, Report, Survivor
+from .nearby import nearby_survivors
+from .pagination import IdCursorPagination
+from .records import build_record, load_record
+from .reporting import file_reports, recount_reports
 from .serializers import (
+    BulkReportSerializer,
+    ChangesSerializer,
     ExchangeSerializer,
-    InventoryCreatorSerializer,
+    ExportSerializer,
     InventorySerializer,
     LocationSerializer,
+    NearbySerializer,
+    NearbySurvivorSerializer,
     RecordSerializer,
     ReportSerializer,
+    SurvivorReadSerializer,
     SurvivorSerializer,
 )
+from .trading import TradeError, execute_trade, execute_trades
 
 # Create your views here.
 
-PTS_WATER = int(config("PTS_WATER"))
-PTS_FOOD = int(config("PTS_FOOD"))
-PTS_MEDS = int(config("PTS_MEDS"))
-PTS_AMMO = int(config("PTS_AMMO"))
+
+def bulk_payload_error(data, name):
+    if not isinstance(data, list) or not data:
+        return Response(
+            {"error": f"Expected a non-empty list of {name}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if len(data) > settings.BULK_MAX_ITEMS:
+        return Response(
+            {"error": f"At most {settings.BULK_MAX_ITEMS} {name} per request"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    return None
 
 
-class SurvivorViewSet(viewsets.ModelViewSet):
+class SurvivorViewSet(VersionedViewMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
 
-    queryset = Survivor.objects.all()
+    queryset = Survivor.objects.select_related("inventory")
     serializer_class = SurvivorSerializer
+    pagination_class = IdCursorPagination
+    cache_kind = "survivor"
+    sparse_extra_columns = ["version"]
+
+    def get_version_fields(self):
+        fields = self.get_requested_fields()
+        if fields is not None and "inventory" not in fields:
+            return ["version"]
+        return ["version", "inventory__version"]
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            columns = SurvivorReadSerializer.columns(self.get_requested_fields())
+            queryset = queryset.values(
+                *dict.fromkeys(["id", *columns, *self.get_version_fields()])
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action in ("list", "retrieve"):
+            return SurvivorReadSerializer
+        return super().get_serializer_class()
+
     # POST /Survivor/trade
     @action(methods=["post"], detail=False)
     def trade(self, request):
         serializer = ExchangeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        trader_1 = serializer.data["trader_1"]
-        trader_2 = serializer.data["trader_2"]
-        if trader_1["id"] == trader_2["id"]:
-            return Response(
-                {"error": "Trade must be between different survivors"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        trader_1_survivor = get_object_or_404(Survivor, pk=trader_1["id"])
-        trader_2_survivor = get_object_or_404(Survivor, pk=trader_2["id"])
-        if trader_1_survivor.infected or trader_2_survivor.infected:
-            return Response(
-                {"error": "One of the trading parties is infected"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        points_1 = (
-            trader_1["trd_water"] * PTS_WATER
-            + trader_1["trd_food"] * PTS_FOOD
-            + trader_1["trd_meds"] * PTS_MEDS
-            + trader_1["trd_ammo"] * PTS_AMMO
-        )
-        points_2 = (
-            trader_2["trd_water"] * PTS_WATER
-            + trader_2["trd_food"] * PTS_FOOD
-            + trader_2["trd_meds"] * PTS_MEDS
-            + trader_2["trd_ammo"] * PTS_AMMO
-        )
-        if points_1 != points_2:
-            return Response(
-                {"error": "Both parties must trade an equal ammount of points"},
-                status=status.HTTP_400_BAD_REQUEST,
+        try:
+            inventories = execute_trade(
+                serializer.validated_data["trader_1"],
+                serializer.validated_data["trader_2"],
             )
+        except TradeError as exc:
+            return Response({"error": exc.message}, status=status.HTTP_400_BAD_REQUEST)
+        serializer = InventorySerializer(inventories, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
-        trader_1_inventory = get_object_or_404(
-            Inventory, owner_survivor=trader_1_survivor
-        )
-        trader_2_inventory = get_object_or_404(
-            Inventory, owner_survivor=trader_2_survivor
-        )
+    # POST /Survivor/trade/batch
+    @action(
+        methods=["post"], detail=False, url_path="trade/batch", url_name="trade-batch"
+    )
+    def trade_batch(self, request):
+        error = bulk_payload_error(request.data, "trades")
+        if error:
+            return error
+        valid, errors = ExchangeSerializer(many=True).validate_each(request.data)
+        results = [
+            {"index": error["index"], "error": error["errors"]} for error in errors
+        ]
+        exchanges = [(data["trader_1"], data["trader_2"]) for _, data in valid]
+        for (index, _), outcome in zip(valid, execute_trades(exchanges)):
+            if isinstance(outcome, TradeError):
+                results.append({"index": index, "error": outcome.message})
+            else:
+                results.append(
+                    {
+                        "index": index,
+                        "inventories": InventorySerializer(outcome, many=True).data,
+                    }
+                )
+        results.sort(key=lambda result: result["index"])
+        return Response({"results": results}, status=status.HTTP_200_OK)
 
-        trader_1_serialize = InventoryCreatorSerializer(instance=trader_1_inventory)
-        trader_1_data = trader_1_serialize.data
-        trader_2_serialize = InventoryCreatorSerializer(instance=trader_2_inventory)
-        trader_2_data = trader_2_serialize.data
-        for attr in trader_1_data:
-            if attr != "id" and attr != "owner_survivor":
-                trader_1_data[attr] += trader_2[f"trd_{attr}"] - trader_1[f"trd_{attr}"]
-                trader_2_data[attr] += trader_1[f"trd_{attr}"] - trader_2[f"trd_{attr}"]
-        trader_1_serialize = InventoryCreatorSerializer(
-            instance=trader_1_inventory, data=trader_1_data
+    # POST /Survivor/bulk
+    @action(methods=["post"], detail=False)
+    def bulk(self, request):
+        error = bulk_payload_error(request.data, "survivors")
+        if error:
+            return error
+        serializer = SurvivorSerializer(many=True)
+        valid, errors = serializer.validate_each(request.data)
+        survivors = serializer.create([data for _, data in valid]) if valid else []
+        invalidate(record=bool(survivors))
+        return Response(
+            {"created": [survivor.id for survivor in survivors], "errors": errors},
+            status=(
+                status.HTTP_201_CREATED if survivors else status.HTTP_400_BAD_REQUEST
+            ),
         )
-        trader_2_serialize = InventoryCreatorSerializer(
-            instance=trader_2_inventory, data=trader_2_data
+
+    # POST /Survivor/locations
+    @action(methods=["post"], detail=False)
+    def locations(self, request):
+        error = bulk_payload_error(request.data, "locations")
+        if error:
+            return error
+        fixes, errors = validate_fixes(request.data)
+        updated = set(apply_fixes(fixes)) if fixes else set()
+        skipped = [survivor_id for survivor_id in fixes if survivor_id not in updated]
+        return Response(
+            {"updated": len(updated), "skipped": skipped, "errors": errors},
+            status=status.HTTP_200_OK if updated else status.HTTP_400_BAD_REQUEST,
         )
-        with transaction.atomic():
-            trader_1_serialize.is_valid(raise_exception=True)
-            trader_2_serialize.is_valid(raise_exception=True)
-            trader_1_serialize.save()
-            trader_2_serialize.save()
-        response = [
-            InventorySerializer(trader_1_inventory).data,
-            InventorySerializer(trader_2_inventory).data,
-        ]
-        return Response(response, status=status.HTTP_200_OK)
 
     # GET /Survivor/report
     @action(methods=["get"], detail=False)
     def record(self, request):
-        infected = Survivor.objects.filter(infected=True).count()
-        survivors_count = Survivor.objects.filter(infected=False).count()
-        total = infected + survivors_count
-        if survivors_count == 0:
+        record = fetch(RECORD, lambda: build_record(load_record()))
+        if record is None:
             return Response(
                 {"error": "No survivors"}, status=status.HTTP_400_BAD_REQUEST
             )
-        infected_percent = (infected / total) * 100
-        survivors_percent = 100 - infected_percent
-        water = 0
-        food = 0
-        meds = 0
-        ammo = 0
-        survivors = Survivor.objects.all()
-        for survivor in survivors:
-            water += survivor.inventory.water
-            food += survivor.inventory.food
-            meds += survivor.inventory.meds
-            ammo += survivor.inventory.ammo
-        avg_water = water / total
-        avg_food = food / total
-        avg_meds = meds / total
-        avg_ammo = ammo / total
-        infected_survivors = Survivor.objects.filter(infected=True)
-        lostpt = 0
-        for iftd in infected_survivors:
-            lostpt += iftd.inventory.water * PTS_WATER
-            lostpt += iftd.inventory.food * PTS_FOOD
-            lostpt += iftd.inventory.meds * PTS_MEDS
-            lostpt += iftd.inventory.ammo * PTS_AMMO
-        serializer = RecordSerializer(
-            {
-                "infected_percent": infected_percent,
-                "survivors_percent": survivors_percent,
-                "avg_water": avg_water,
-                "avg_food": avg_food,
-                "avg_meds": avg_meds,
-                "avg_ammo": avg_ammo,
-                "lostpt": lostpt,
-            }
-        )
+        serializer = RecordSerializer(record)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    def retrieve(self, request, *args, **kwargs):
-        pk = kwargs["pk"]
-        survivor = get_object_or_404(Survivor, pk=pk)
-        if survivor.infected:
-            return Response(
-                {"error": "Selected survivor is infected"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        return super().retrieve(request, *args, **kwargs)
+    # GET /Survivor/cache
+    @action(methods=["get"], detail=False)
+    def cache(self, request):
+        return Response(stats(), status=status.HTTP_200_OK)
+
+    # GET /Survivor/nearby?lat=&lon=&radius=&limit=
+    @action(methods=["get"], detail=False)
+    def nearby(self, request):
+        serializer = NearbySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        survivors = nearby_survivors(
+            params["lat"], params["lon"], params["radius"]
+        ).select_related("inventory")[: params["limit"]]
+        serializer = NearbySurvivorSerializer(survivors, many=True)
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
+    # GET /Survivor/export?output=ndjson|csv&infected=&min_id=&max_id=
+    @action(methods=["get"], detail=False)
+    def export(self, request):
+        serializer = ExportSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = dict(serializer.validated_data)
+        export_format = params.pop("output")
+        response = StreamingHttpResponse(
+            export_chunks(export_queryset(**params), export_format),
+            content_type=EXPORT_FORMATS[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="survivors.{export_format}"'
+        )
+        return response
+
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        invalidate(record=True)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_owners([serializer.instance.pk], record=True)
+
+    def perform_destroy(self, instance):
+        # Reports filed by this survivor go away with it.
+        with transaction.atomic():
+            survivor_id = instance.pk
+            reported_ids = list(instance.reports.values_list("gotReported", flat=True))
+            invalidate_owners([survivor_id], record=True)
+            instance.delete()
+            record_deletions([survivor_id])
+            recount_reports(reported_ids)
 
     def partial_update(self, request, *args, **kwargs):
-        pk = kwargs["pk"]
-        survivor = get_object_or_404(Survivor, pk=pk)
+        survivor = self.get_object()
         if not survivor.infected:
             serializer = LocationSerializer(survivor, data=request.data)
             serializer.is_valid(raise_exception=True)
-            serializer.save()
+            with transaction.atomic():
+                serializer.save()
+                record_moves({survivor.pk: (survivor.latitude, survivor.longitude)})
+            invalidate([survivor.pk])
             response_serializer = SurvivorSerializer(survivor)
             return Response(response_serializer.data, status=status.HTTP_200_OK)
         else:
@@ -169,22 +228,22 @@ class SurvivorViewSet(viewsets.ModelViewSet):
             )
 
 
-class InventoryViewSet(viewsets.ModelViewSet):
+class InventoryViewSet(
+    VersionedViewMixin, SparseFieldsViewMixin, viewsets.ModelViewSet
+):
 
     queryset = Inventory.objects.all()
     serializer_class = InventorySerializer
+    pagination_class = IdCursorPagination
+    cache_kind = "inventory"
+    infected_field = "owner_survivor__infected"
+    sparse_extra_columns = ["version"]
 
-    def retrieve(self, request, *args, **kwargs):
-        pk = kwargs["pk"]
-        inventory = get_object_or_404(Inventory, pk=pk)
-        owner_id = inventory.owner_survivor.id
-        survivor = get_object_or_404(Survivor, pk=owner_id)
-        if survivor.infected:
-            return Response(
-                {"error": "Selected survivor is infected"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-        return super().retrieve(request, *args, **kwargs)
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            queryset = queryset.select_related("owner_survivor")
+        return queryset
 
     def create(self, request, *args, **kwargs):
         return Response(
@@ -205,7 +264,49 @@ class InventoryViewSet(viewsets.ModelViewSet):
         )
 
 
+class ChangeViewSet(viewsets.ViewSet):
+
+    # GET /changes?since=&limit=
+    def list(self, request):
+        serializer = ChangesSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        params = serializer.validated_data
+        changes, more = changes_since(params["since"], params["limit"])
+        return Response(
+            {
+                "changes": changes,
+                "next": changes[-1]["id"] if changes else params["since"],
+                "more": more,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
 class ReportViewSet(viewsets.ModelViewSet):
 
     queryset = Report.objects.all()
     serializer_class = ReportSerializer
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            recount_reports([instance.gotReported_id])
+
+    # POST /Report/bulk
+    @action(methods=["post"], detail=False)
+    def bulk(self, request):
+        error = bulk_payload_error(request.data, "reports")
+        if error:
+            return error
+        valid, errors = BulkReportSerializer(many=True).validate_each(request.data)
+        pairs = [(data["gotReported"], data["whoReported"]) for _, data in valid]
+        report_errors, accepted, infected = file_reports(pairs)
+        for error in report_errors:
+            error["index"] = valid[error["index"]][0]
+        errors = sorted(errors + report_errors, key=lambda error: error["index"])
+        return Response(
+            {"accepted": accepted, "infected": infected, "errors": errors},
+            status=(
+                status.HTTP_201_CREATED if accepted else status.HTTP_400_BAD_REQUEST
+            ),
+        )